@@ -0,0 +1,111 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from zlib import crc32
+
+import numpy as np
+from numpy.typing import NDArray
+
+from vnag.embedder import BaseEmbedder
+from vnag.object import Segment
+from vnag.vectors.hnswlib_vector import HnswlibVector
+
+
+class HashEmbedder(BaseEmbedder):
+    """按文本哈希生成固定随机向量，相同文本得到相同向量"""
+
+    def encode(self, texts: list[str]) -> NDArray[np.float32]:
+        return np.stack([
+            np.random.default_rng(crc32(text.encode())).standard_normal(16).astype(np.float32)
+            for text in texts
+        ])
+
+
+def make_segment(source: str, index: int, text: str) -> Segment:
+    return Segment(text=text, metadata={"source": source, "chunk_index": str(index)})
+
+
+class HnswlibVectorTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.folder = tempfile.TemporaryDirectory()
+        self.addCleanup(self.folder.cleanup)
+
+        patcher = mock.patch(
+            "vnag.vectors.hnswlib_vector.get_folder_path",
+            return_value=Path(self.folder.name),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.embedder = HashEmbedder()
+
+    def open_vector(self) -> HnswlibVector:
+        vector = HnswlibVector("kb", self.embedder)
+        self.addCleanup(vector.conn.close)
+        return vector
+
+    def test_upsert_existing_id(self) -> None:
+        vector = self.open_vector()
+        vector.add_segments([make_segment("a", 0, "old text"), make_segment("a", 1, "other")])
+        vector.add_segments([make_segment("a", 0, "new text")])
+
+        self.assertEqual(vector.count, 2)
+
+        texts = [seg.text for seg in vector.retrieve("new text", k=10)]
+        self.assertEqual(texts[0], "new text")
+        self.assertEqual(sorted(texts), ["new text", "other"])
+
+    def test_delete_and_readd(self) -> None:
+        vector = self.open_vector()
+        vector.add_segments([make_segment("a", i, f"text {i}") for i in range(3)])
+
+        # 删除标签最大的文档，重新添加时会复用该标签
+        self.assertTrue(vector.delete_segments(["a_2", "a_0"]))
+        self.assertEqual(vector.count, 1)
+        self.assertEqual([seg.text for seg in vector.retrieve("text 2", k=10)], ["text 1"])
+
+        vector.add_segments([make_segment("a", 2, "text 2"), make_segment("a", 0, "text 0")])
+        self.assertEqual(vector.count, 3)
+
+        texts = [seg.text for seg in vector.retrieve("text 2", k=10)]
+        self.assertEqual(texts[0], "text 2")
+        self.assertEqual(sorted(texts), ["text 0", "text 1", "text 2"])
+
+    def test_retrieve_more_than_count(self) -> None:
+        vector = self.open_vector()
+        self.assertEqual(vector.count, 0)
+        self.assertEqual(vector.retrieve("anything", k=5), [])
+
+        vector.add_segments([make_segment("a", i, f"text {i}") for i in range(3)])
+        self.assertEqual(vector.count, 3)
+        self.assertEqual(len(vector.retrieve("text 1", k=50)), 3)
+
+    def test_resize(self) -> None:
+        with mock.patch.object(HnswlibVector, "init_capacity", 4):
+            vector = self.open_vector()
+            vector.add_segments([make_segment("a", i, f"text {i}") for i in range(10)])
+
+        self.assertEqual(vector.count, 10)
+        self.assertEqual(vector.retrieve("text 7", k=1)[0].text, "text 7")
+
+    def test_reopen_from_disk(self) -> None:
+        vector = self.open_vector()
+        vector.add_segments([make_segment("a", i, f"text {i}") for i in range(5)])
+        vector.delete_segments(["a_3"])
+        vector.conn.close()
+
+        reopened = self.open_vector()
+        self.assertEqual(reopened.count, 4)
+
+        result = reopened.retrieve("text 4", k=10)
+        self.assertEqual(result[0].text, "text 4")
+        self.assertEqual(result[0].metadata, {"source": "a", "chunk_index": "4"})
+        self.assertNotIn("text 3", [seg.text for seg in result])
+
+        segments = reopened.get_segments(["a_1"])
+        self.assertEqual([seg.text for seg in segments], ["text 1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
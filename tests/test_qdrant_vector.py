@@ -0,0 +1,10 @@
+import unittest
+from uuid import NAMESPACE_DNS, uuid5
+
+from vnag.vectors.qdrant_vector import get_point_id
+
+
+class GetPointIdTestCase(unittest.TestCase):
+    def test_matches_uuid5(self) -> None:
+        for string_id in ["", "a_0", "/home/user/文档/说明.md_12"]:
+            self.assertEqual(get_point_id(string_id), str(uuid5(NAMESPACE_DNS, string_id)))
@@ -0,0 +1,92 @@
+import unittest
+
+from vnag.segmenters.markdown_segmenter import MarkdownSegmenter
+
+
+SAMPLE_TEXT: str = """前言部分的内容。
+
+# 第一章
+
+第一章的正文，包含一些说明。
+
+```python
+# 这是代码中的注释，不是标题
+print("hello")
+```
+
+## 1.1 小节
+
+""" + "小节内容。" * 200 + """
+
+~~~
+# 波浪线围栏中的注释
+~~~
+
+# 第二章
+
+Setext 标题
+-----------
+
+最后一段内容。
+"""
+
+
+def split_blocks(text: str, size: int) -> list[str]:
+    """按固定长度切分文本，模拟分块读取文件"""
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class MarkdownSegmenterTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.segmenter = MarkdownSegmenter(chunk_size=300)
+        self.metadata = {"source": "sample.md"}
+
+    def test_parse_stream_matches_parse(self) -> None:
+        expected = self.segmenter.parse(SAMPLE_TEXT, self.metadata)
+
+        for size in (7, 64, 500, len(SAMPLE_TEXT)):
+            result = list(
+                self.segmenter.parse_stream(split_blocks(SAMPLE_TEXT, size), self.metadata)
+            )
+            self.assertEqual(result, expected, f"block size {size}")
+
+    def test_parse_stream_fence_with_info_string_does_not_close(self) -> None:
+        text = "# A\n\n```\n```python\n# not heading\n```\n\n# B\nbody\n"
+        expected = self.segmenter.parse(text, self.metadata)
+
+        result = list(self.segmenter.parse_stream(text.splitlines(keepends=True), self.metadata))
+        self.assertEqual(result, expected)
+
+    def test_parse_stream_heading_in_html_comment(self) -> None:
+        text = (
+            "# Intro\n" + "Some text. " * 40 + "\n\n<!--\n# Draft section\nnot ready\n-->\n\n"
+            "More intro text.\n\n# Next\n" + "body " * 80 + "\n"
+        )
+        self.assert_stream_matches_parse(text)
+
+    def test_parse_stream_fence_in_list_item(self) -> None:
+        text = (
+            "# Intro\n" + "Some text. " * 40 + "\n\n- item\n\n  ```\n# not heading\n  ```\n\n"
+            "# Next\n" + "body " * 80 + "\n"
+        )
+        self.assert_stream_matches_parse(text)
+
+    def assert_stream_matches_parse(self, text: str) -> None:
+        expected = self.segmenter.parse(text, self.metadata)
+
+        for blocks in (text.splitlines(keepends=True), [text], split_blocks(text, 64)):
+            result = list(self.segmenter.parse_stream(blocks, self.metadata))
+            self.assertEqual(result, expected)
+
+    def test_parse_stream_numbers_chunks_continuously(self) -> None:
+        result = list(self.segmenter.parse_stream(split_blocks(SAMPLE_TEXT, 16), self.metadata))
+
+        indexes = [seg.metadata["chunk_index"] for seg in result]
+        self.assertEqual(indexes, [str(i) for i in range(len(result))])
+
+    def test_parse_stream_empty_input(self) -> None:
+        self.assertEqual(list(self.segmenter.parse_stream([], self.metadata)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
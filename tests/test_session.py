@@ -0,0 +1,46 @@
+import json
+import unittest
+
+from vnag.agent import TaskAgent
+from vnag.constant import Role
+from vnag.object import Message, Profile, Session, Usage
+
+
+class FakeEngine:
+    def get_skill_catalog(self) -> str:
+        return ""
+
+
+class SessionDumpTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        profile = Profile(name="助手", prompt="系统提示词", tools=[])
+        session = Session(id="session-1", profile="助手", name="默认会话", model="test")
+        self.agent = TaskAgent(FakeEngine(), profile, session, save=False)  # type: ignore[arg-type]
+
+    def assert_roundtrip(self) -> None:
+        text = self.agent.dump_session()
+        self.assertEqual(json.loads(text), self.agent.session.model_dump(mode="json"))
+        self.assertEqual(Session.model_validate_json(text), self.agent.session)
+
+    def test_dump_matches_model_dump(self) -> None:
+        self.assert_roundtrip()
+
+        self.agent.session.messages.append(Message(role=Role.USER, content="你好\n\"引号\""))
+        self.agent.session.messages.append(
+            Message(role=Role.ASSISTANT, content="回答", usage=Usage(input_tokens=3, output_tokens=2))
+        )
+        self.agent.session.summary = "摘要"
+        self.assert_roundtrip()
+
+    def test_dump_after_messages_deleted(self) -> None:
+        self.agent.session.messages.append(Message(role=Role.USER, content="问题"))
+        self.agent.session.messages.append(Message(role=Role.ASSISTANT, content="回答"))
+        self.agent.dump_session()
+
+        del self.agent.session.messages[1:]
+        self.assert_roundtrip()
+        self.assertEqual(len(self.agent.message_cache), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
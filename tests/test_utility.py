@@ -0,0 +1,34 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from vnag.utility import format_size, read_text_file
+
+
+class FormatSizeTestCase(unittest.TestCase):
+    def test_bytes(self) -> None:
+        self.assertEqual(format_size(0), "0 B")
+        self.assertEqual(format_size(1023), "1023 B")
+
+    def test_units(self) -> None:
+        self.assertEqual(format_size(1024), "1.0 KB")
+        self.assertEqual(format_size(1536), "1.5 KB")
+        self.assertEqual(format_size(5 * 1024 ** 2 + 1024 ** 2 // 4), "5.2 MB")
+        self.assertEqual(format_size(3 * 1024 ** 3), "3.0 GB")
+
+    def test_largest_unit(self) -> None:
+        self.assertEqual(format_size(2048 * 1024 ** 4), "2048.0 TB")
+
+
+class ReadTextFileTestCase(unittest.TestCase):
+    def test_newlines_match_text_mode(self) -> None:
+        with tempfile.TemporaryDirectory() as folder:
+            path: Path = Path(folder).joinpath("doc.md")
+            path.write_bytes("标题\r\n正文\r结尾\n".encode())
+
+            self.assertEqual(read_text_file(path), path.read_text(encoding="utf-8"))
+            self.assertEqual(read_text_file(path), "标题\n正文\n结尾\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,11 @@
-import json
+import os
 from dataclasses import dataclass, field
 from pathlib import Path
 from uuid import uuid4
 from typing import TYPE_CHECKING, Any
-from collections.abc import Generator
+from collections.abc import Callable, Generator
+
+import orjson
 
 from .object import (
     Session, Profile, Delta, Request, Response, Message,
@@ -56,6 +58,27 @@ COMPACTION_PROMPT: str = f"""
 SUMMARY_PREFIX: str = "[vnag:session_summary]"
 
 
+SessionWriter = Callable[["TaskAgent"], None]
+
+
+_session_writer: SessionWriter | None = None
+
+
+def set_session_writer(writer: SessionWriter | None) -> None:
+    """设置会话保存函数，未设置时直接同步写入文件。"""
+    global _session_writer
+    _session_writer = writer
+
+
+def write_session_file(session_id: str, text: str) -> None:
+    """将序列化后的会话写入文件（先写临时文件再替换，避免写入中断导致文件损坏）"""
+    file_path: Path = SESSION_DIR.joinpath(f"{session_id}.json")
+    temp_path: Path = SESSION_DIR.joinpath(f"{session_id}.json.tmp")
+
+    temp_path.write_bytes(text.encode("UTF-8"))
+    os.replace(temp_path, file_path)
+
+
 class TaskAgent:
     """
     标准的、可直接使用的任务智能体。
@@ -89,6 +112,9 @@ class TaskAgent:
         self.round_prompt: str = ""
         self.round_start: int = 0
 
+        # 消息序列化缓存：消息对象 id -> (消息对象, JSON 文本)
+        self.message_cache: dict[int, tuple[Message, str]] = {}
+
         # 确保会话始终以 system 消息开头，后续逻辑都依赖这个约定。
         self._ensure_system_message()
 
@@ -154,20 +180,61 @@ class TaskAgent:
         )
 
     def _save_session(self) -> None:
-        """保存会话状态到文件"""
+        """保存会话状态，已设置会话保存函数时交由其处理（如合并延迟写入）"""
         if not self.save:
             return
 
-        data: dict = self.session.model_dump()
-        file_path: Path = SESSION_DIR.joinpath(f"{self.session.id}.json")
+        if _session_writer:
+            _session_writer(self)
+        else:
+            self.write_session()
 
-        with open(file_path, mode="w+", encoding="UTF-8") as f:
-            json.dump(
-                data,
-                f,
-                indent=4,
-                ensure_ascii=False
-            )
+    def write_session(self) -> None:
+        """立即将会话状态写入文件"""
+        write_session_file(self.session.id, self.dump_session())
+
+    def _dump_message(self, message: Message) -> str:
+        """序列化单条消息，已入库的消息不再修改，因此复用缓存结果"""
+        cached: tuple[Message, str] | None = self.message_cache.get(id(message))
+        if cached and cached[0] is message:
+            return cached[1]
+
+        text: str = message.model_dump_json()
+        self.message_cache[id(message)] = (message, text)
+        return text
+
+    def dump_session(self) -> str:
+        """
+        序列化会话为 JSON 文本
+
+        每条消息单独占一行，只有新增消息需要重新序列化，
+        避免长会话每次保存都对全部历史消息执行 model_dump。
+        """
+        # 只读取一次消息列表，避免工作线程同时追加消息导致前后不一致
+        messages: list[Message] = list(self.session.messages)
+        message_texts: list[str] = [self._dump_message(msg) for msg in messages]
+
+        # 清理已被删除消息的缓存
+        if len(self.message_cache) > len(message_texts):
+            self.message_cache = {
+                id(msg): (msg, text) for msg, text in zip(messages, message_texts, strict=True)
+            }
+
+        data: dict = self.session.model_dump(exclude={"messages"})
+        lines: list[str] = []
+
+        for name in Session.model_fields:
+            if name == "messages":
+                if message_texts:
+                    body: str = ",\n".join("        " + text for text in message_texts)
+                    lines.append(f'    "messages": [\n{body}\n    ]')
+                else:
+                    lines.append('    "messages": []')
+            else:
+                value: str = orjson.dumps(data[name]).decode()
+                lines.append(f'    "{name}": {value}')
+
+        return "{\n" + ",\n".join(lines) + "\n}"
 
     def _merge_reasoning(
         self,
@@ -1,10 +1,16 @@
 from abc import ABC, abstractmethod
+from collections.abc import Callable
+from functools import cached_property, lru_cache
 from typing import Any
 
 import numpy as np
 from numpy.typing import NDArray
 
 
+# 查询向量缓存的最大条目数
+QUERY_CACHE_SIZE: int = 1024
+
+
 class BaseEmbedder(ABC):
     """嵌入器（Embedding）的抽象基类"""
 
@@ -15,3 +21,38 @@ class BaseEmbedder(ABC):
     def encode(self, texts: list[str]) -> NDArray[np.float32]:
         """将文本列表编码为向量"""
         pass
+
+    def encode_query(self, text: str) -> NDArray[np.float32]:
+        """
+        将单条查询文本编码为向量，返回形状为 (1, 维度) 的只读数组
+
+        相同的查询直接返回缓存结果，避免重复的模型推理或网络请求。
+        """
+        return self._query_encoder(text)
+
+    @cached_property
+    def dimension(self) -> int:
+        """
+        向量维度
+
+        默认编码一条样本文本获取，结果缓存在实例上；
+        可直接读取模型配置的子类应重写以省去这次编码。
+        """
+        dimension: int = self.encode(["dimension"]).shape[1]
+        return dimension
+
+    def close(self) -> None:
+        """释放嵌入器占用的资源，子类持有进程池等资源时应重写并调用本方法"""
+        # 清空查询向量缓存
+        self.__dict__.pop("_query_encoder", None)
+
+    @cached_property
+    def _query_encoder(self) -> Callable[[str], NDArray[np.float32]]:
+        """创建当前实例专属的带 LRU 缓存的查询编码函数"""
+        @lru_cache(maxsize=QUERY_CACHE_SIZE)
+        def encode_query(text: str) -> NDArray[np.float32]:
+            embedding: NDArray[np.float32] = self.encode([text])
+            embedding.flags.writeable = False
+            return embedding
+
+        return encode_query
@@ -1,11 +1,31 @@
+from functools import cached_property, lru_cache
+from typing import Any, Literal
+
 import numpy as np
 from numpy.typing import NDArray
 
+import torch
 from sentence_transformers import SentenceTransformer
 
 from vnag.embedder import BaseEmbedder
 
 
+# 有多张 GPU 时，单次编码达到该数量的文本使用多进程并行编码
+MULTI_PROCESS_THRESHOLD: int = 1024
+
+
+@lru_cache(maxsize=4)
+def load_model(model_name: str) -> SentenceTransformer:
+    """加载 SentenceTransformer 模型，同名模型在多个实例间共享"""
+    model: SentenceTransformer = SentenceTransformer(model_name)
+
+    # GPU 上使用半精度推理，显存和计算量减半
+    if model.device.type == "cuda":
+        model.half()
+
+    return model
+
+
 class SentenceEmbedder(BaseEmbedder):
     """SentenceTransformer 本地模型适配器"""
 
@@ -16,8 +36,35 @@ class SentenceEmbedder(BaseEmbedder):
 
     def __init__(self, model_name: str = "BAAI/bge-large-zh-v1.5") -> None:
         """初始化 SentenceTransformer 模型"""
-        self.model: SentenceTransformer = SentenceTransformer(model_name)
+        self.model: SentenceTransformer = load_model(model_name)
+
+        # 多 GPU 编码进程池，首次需要时创建
+        self.pool: dict[Literal["input", "output", "processes"], Any] | None = None
 
     def encode(self, texts: list[str]) -> NDArray[np.float32]:
         """编码文本为向量"""
-        return self.model.encode(texts)
+        if len(texts) >= MULTI_PROCESS_THRESHOLD and torch.cuda.device_count() > 1:
+            if self.pool is None:
+                self.pool = self.model.start_multi_process_pool()
+            result: Any = self.model.encode(texts, pool=self.pool)
+        else:
+            result = self.model.encode(texts)
+
+        embeddings: NDArray[np.float32] = result.astype(np.float32, copy=False)
+        return embeddings
+
+    @cached_property
+    def dimension(self) -> int:
+        """向量维度，直接读取模型配置，无需推理"""
+        dimension: int | None = self.model.get_embedding_dimension()
+        if dimension is None:
+            return super().dimension
+        return dimension
+
+    def close(self) -> None:
+        """关闭多 GPU 编码进程池"""
+        if self.pool is not None:
+            self.model.stop_multi_process_pool(self.pool)
+            self.pool = None
+
+        super().close()
@@ -1,4 +1,3 @@
-import json
 from pathlib import Path
 from collections.abc import Generator
 from datetime import datetime
@@ -16,7 +15,7 @@ from .mcp import McpManager
 from .local import LocalManager, LocalTool
 from .agent import Profile, TaskAgent, AgentTool
 from .skill import SkillManager
-from .utility import PROFILE_DIR, SESSION_DIR
+from .utility import PROFILE_DIR, SESSION_DIR, scan_json_files
 
 
 # 默认智能体配置
@@ -74,27 +73,24 @@ class AgentEngine:
         self._profiles[default_profile.name] = default_profile
 
         # 加载用户自定义配置
-        for file_path in PROFILE_DIR.glob("*.json"):
-            with open(file_path, encoding="UTF-8") as f:
-                data: dict = json.load(f)
-                profile: Profile = Profile.model_validate(data)
-                self._profiles[profile.name] = profile
+        for file_path in scan_json_files(PROFILE_DIR):
+            profile: Profile = Profile.model_validate_json(file_path.read_bytes())
+            self._profiles[profile.name] = profile
 
     def _save_profile(self, profile: Profile) -> None:
         """保存智能体配置到JSON文件"""
         profile_path: Path = PROFILE_DIR.joinpath(f"{profile.name}.json")
         with open(profile_path, "w", encoding="UTF-8") as f:
-            json.dump(profile.model_dump(), f, indent=4, ensure_ascii=False)
+            f.write(profile.model_dump_json(indent=4))
 
     def _load_agents(self) -> None:
         """从JSON文件加载所有智能体"""
-        for file_path in SESSION_DIR.glob("*.json"):
-            with open(file_path, encoding="UTF-8") as f:
-                data: dict = json.load(f)
-                session: Session = Session.model_validate(data)
-                profile: Profile = self._profiles[session.profile]
-                agent: TaskAgent = TaskAgent(self, profile, session, save=True)
-                self._agents[session.id] = agent
+        for file_path in scan_json_files(SESSION_DIR):
+            # 直接由 pydantic 解析 JSON，无需先转换为字典
+            session: Session = Session.model_validate_json(file_path.read_bytes())
+            profile: Profile = self._profiles[session.profile]
+            agent: TaskAgent = TaskAgent(self, profile, session, save=True)
+            self._agents[session.id] = agent
 
     def get_local_schemas(self) -> dict[str, ToolSchema]:
         """获取本地工具的Schema"""
@@ -182,8 +178,9 @@ class AgentEngine:
 
         self._agents.pop(session_id)
 
+        # 延迟保存时会话文件可能尚未写入
         session_path: Path = SESSION_DIR.joinpath(f"{session_id}.json")
-        session_path.unlink()
+        session_path.unlink(missing_ok=True)
 
         return True
 
@@ -1,52 +1,41 @@
 """Gateway 注册表"""
 
+from importlib import import_module
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from vnag.gateway import BaseGateway
 
-from .openai_gateway import OpenaiGateway
-from .completion_gateway import CompletionGateway
-from .anthropic_gateway import AnthropicGateway
-from .dashscope_gateway import DashscopeGateway
-from .deepseek_gateway import DeepseekGateway
-from .minimax_gateway import MinimaxGateway
-from .bailian_gateway import BailianGateway
-from .ollama_gateway import OllamaGateway
-from .openrouter_gateway import OpenrouterGateway
-from .moonshot_gateway import MoonshotGateway
-from .zhipu_gateway import ZhipuGateway
-from .litellm_gateway import LitellmGateway
-from .volcengine_gateway import VolcengineGateway
-from .bedrock_gateway import BedrockGateway
-from .gemini_gateway import GeminiGateway
-
-
-# Gateway 类型名称到类的映射
-GATEWAY_CLASSES: dict[str, type["BaseGateway"]] = {
-    OpenaiGateway.default_name: OpenaiGateway,
-    CompletionGateway.default_name: CompletionGateway,
-    AnthropicGateway.default_name: AnthropicGateway,
-    DashscopeGateway.default_name: DashscopeGateway,
-    DeepseekGateway.default_name: DeepseekGateway,
-    MinimaxGateway.default_name: MinimaxGateway,
-    BailianGateway.default_name: BailianGateway,
-    OllamaGateway.default_name: OllamaGateway,
-    OpenrouterGateway.default_name: OpenrouterGateway,
-    MoonshotGateway.default_name: MoonshotGateway,
-    ZhipuGateway.default_name: ZhipuGateway,
-    LitellmGateway.default_name: LitellmGateway,
-    VolcengineGateway.default_name: VolcengineGateway,
-    BedrockGateway.default_name: BedrockGateway,
-    GeminiGateway.default_name: GeminiGateway,
+
+# Gateway 类型名称到（模块名, 类名）的映射，与各 gateway 的 default_name 一致
+# 各 gateway 依赖的 SDK 较重，按需导入以缩短启动时间
+GATEWAY_MODULES: dict[str, tuple[str, str]] = {
+    "OpenAI": ("openai_gateway", "OpenaiGateway"),
+    "Completion": ("completion_gateway", "CompletionGateway"),
+    "Anthropic": ("anthropic_gateway", "AnthropicGateway"),
+    "DashScope": ("dashscope_gateway", "DashscopeGateway"),
+    "DeepSeek": ("deepseek_gateway", "DeepseekGateway"),
+    "MiniMax": ("minimax_gateway", "MinimaxGateway"),
+    "BaiLian": ("bailian_gateway", "BailianGateway"),
+    "Ollama": ("ollama_gateway", "OllamaGateway"),
+    "OpenRouter": ("openrouter_gateway", "OpenrouterGateway"),
+    "Moonshot": ("moonshot_gateway", "MoonshotGateway"),
+    "ZhiPu": ("zhipu_gateway", "ZhipuGateway"),
+    "LiteLLM": ("litellm_gateway", "LitellmGateway"),
+    "Volcengine": ("volcengine_gateway", "VolcengineGateway"),
+    "Bedrock": ("bedrock_gateway", "BedrockGateway"),
+    "Gemini": ("gemini_gateway", "GeminiGateway"),
 }
 
 
 def get_gateway_names() -> list[str]:
     """获取所有可用的 gateway 名称列表"""
-    return list(GATEWAY_CLASSES.keys())
+    return list(GATEWAY_MODULES.keys())
 
 
 def get_gateway_class(name: str) -> type["BaseGateway"]:
     """根据名称获取 gateway 类，如果名称不存在则返回 CompletionGateway（最通用）"""
-    return GATEWAY_CLASSES.get(name, CompletionGateway)
+    module_name, class_name = GATEWAY_MODULES.get(name, GATEWAY_MODULES["Completion"])
+    module = import_module(f".{module_name}", __name__)
+    gateway_class: type[BaseGateway] = getattr(module, class_name)
+    return gateway_class
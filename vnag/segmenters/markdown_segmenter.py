@@ -1,3 +1,4 @@
+from collections.abc import Generator, Iterable
 from typing import Any
 
 from markdown_it import MarkdownIt
@@ -35,10 +36,111 @@ class MarkdownSegmenter(BaseSegmenter):
         tokens: list[Token] = self.md_parser.parse(text)
         sections: list[tuple[str, str]] = group_by_headings(text, tokens)
 
-        segments: list[Segment] = []
+        segments, _, _ = self._pack_sections(sections, metadata, 0, 0)
+        return segments
+
+    def parse_stream(
+        self,
+        blocks: Iterable[str],
+        metadata: dict[str, Any]
+    ) -> Generator[Segment, None, None]:
+        """
+        流式解析 Markdown 文本，逐步生成 Segment。
+
+        输入为按块读取的文本（如每次读取 1 MiB）。缓冲区超过 `chunk_size` 后，
+        用 markdown-it 解析得到最后一个顶层标题，在其所在行切开缓冲区，
+        将之前的部分交给 `parse` 的同一套流程处理，因此结果与一次性
+        调用 `parse` 相同，而内存占用只与单块大小相关。
+
+        参数:
+            blocks: 按顺序给出的文本块。
+            metadata: 与该文本关联的元数据字典。
+        """
+        buffer: str = ""
+        next_check: int = self.chunk_size   # 缓冲区达到该长度时才尝试切分
         segment_index: int = 0
         section_order: int = 0
 
+        for block in blocks:
+            buffer += block
+            if len(buffer) < next_check:
+                continue
+
+            cut: int = self._find_cut(buffer)
+            if cut:
+                head: str = buffer[:cut]
+                buffer = buffer[cut:]
+
+                segments, segment_index, section_order = self._parse_part(
+                    head, metadata, segment_index, section_order
+                )
+                yield from segments
+
+            # 找不到切分点时按倍数推迟下次检查，避免反复解析整个缓冲区
+            next_check = max(self.chunk_size, len(buffer) * 2)
+
+        if buffer:
+            segments, _, _ = self._parse_part(
+                buffer, metadata, segment_index, section_order
+            )
+            yield from segments
+
+    def _find_cut(self, text: str) -> int:
+        """
+        寻找缓冲区中可以安全切开的位置，返回字符偏移，找不到时返回 0
+
+        只解析到最后一个完整行，取其中最后一个顶层标题（不在列表、引用、
+        代码块或 HTML 块内）的起始行。该位置之前需至少包含一个标题，
+        使前后两段分别解析得到的章节与整体解析一致。
+        """
+        complete: str = text[:text.rfind("\n") + 1]
+        tokens: list[Token] = self.md_parser.parse(complete)
+
+        headings: list[tuple[int, int]] = [
+            (token.map[0], token.level)
+            for token in tokens
+            if token.type == "heading_open" and token.map
+        ]
+        if len(headings) < 2:
+            return 0
+
+        first_line: int = headings[0][0]
+        cut_lines: list[int] = [
+            line for line, level in headings if level == 0 and line > first_line
+        ]
+        if not cut_lines:
+            return 0
+
+        lines: list[str] = complete.split("\n")
+        return sum(len(line) + 1 for line in lines[:cut_lines[-1]])
+
+    def _parse_part(
+        self,
+        text: str,
+        metadata: dict[str, Any],
+        segment_index: int,
+        section_order: int
+    ) -> tuple[list[Segment], int, int]:
+        """解析流式输入中的一段文本，编号从给定位置继续"""
+        tokens: list[Token] = self.md_parser.parse(text)
+        sections: list[tuple[str, str]] = group_by_headings(text, tokens)
+        return self._pack_sections(sections, metadata, segment_index, section_order)
+
+    def _pack_sections(
+        self,
+        sections: list[tuple[str, str]],
+        metadata: dict[str, Any],
+        segment_index: int,
+        section_order: int
+    ) -> tuple[list[Segment], int, int]:
+        """
+        将章节装箱为 Segment 列表。
+
+        返回:
+            (Segment 列表, 下一个片段编号, 下一个章节序号)
+        """
+        segments: list[Segment] = []
+
         for title, content in sections:
             # 统一使用通用装箱逻辑
             chunks: list[str] = pack_section(content, self.chunk_size)
@@ -62,7 +164,7 @@ class MarkdownSegmenter(BaseSegmenter):
 
             section_order += 1
 
-        return segments
+        return segments, segment_index, section_order
 
 
 def group_by_headings(text: str, tokens: list[Token]) -> list[tuple[str, str]]:
@@ -76,8 +178,6 @@ def group_by_headings(text: str, tokens: list[Token]) -> list[tuple[str, str]]:
     返回:
         一个元组列表，每个元组包含 (章节标题, 章节内容)。
     """
-    sections: list[tuple[str, str]] = []
-    current_section_lines: list[str] = []
     current_title: str = "默认章节"  # 为文档开始处、第一个标题前的内容设置默认标题
 
     lines: list[str] = text.splitlines()
@@ -86,31 +186,25 @@ def group_by_headings(text: str, tokens: list[Token]) -> list[tuple[str, str]]:
     heading_indices: dict[int, str] = {
         token.map[0]: token.content
         for token in tokens
-        if token.type == "heading_open" and token.map
+        if token.type == "heading_open" and token.map and token.map[0] < len(lines)
     }
 
     # 如果没有找到任何标题，则将整个文档作为一个章节处理
     if not heading_indices:
         return [(current_title, text)]
 
-    # 逐行遍历，根据标题行进行内容分组
-    for i, line in enumerate(lines):
-        if i in heading_indices:
-            # 当遇到一个新的标题时，保存前一个已收集的章节内容
-            if current_section_lines:
-                sections.append(
-                    (current_title, "\n".join(current_section_lines).strip())
-                )
+    # 以标题行号作为切分点，按行号区间整体切片拼接，避免逐行遍历
+    starts: list[int] = sorted(heading_indices)
+    sections: list[tuple[str, str]] = []
 
-            # 开始一个新的章节
-            current_title = heading_indices[i]
-            current_section_lines = [line]
-        else:
-            # 将当前行内容追加到当前章节
-            current_section_lines.append(line)
+    # 第一个标题之前的内容
+    if starts[0] > 0:
+        sections.append((current_title, "\n".join(lines[:starts[0]]).strip()))
 
-    # 在遍历结束后，保存最后一个章节的内容
-    if current_section_lines:
-        sections.append((current_title, "\n".join(current_section_lines).strip()))
+    ends: list[int] = starts[1:] + [len(lines)]
+    for start, end in zip(starts, ends, strict=True):
+        sections.append(
+            (heading_indices[start], "\n".join(lines[start:end]).strip())
+        )
 
     return sections
@@ -2,16 +2,22 @@
 from typing import Any
 from pathlib import Path
 from datetime import datetime
-import json
+import os
 
-from ..utility import get_folder_path, get_file_path
+import orjson
+
+from ..utility import get_folder_path
 from ..embedder import BaseEmbedder
+from ..embedders import get_embedder_names, get_embedder_class
 from ..vectors.duckdb_vector import DuckdbVector
 
 
 # 知识库存储目录
 KNOWLEDGE_DIR: str = "knowledge"
 
+# 元数据缓存：文件路径 -> (修改时间, 元数据)
+_metadata_cache: dict[Path, tuple[int, dict[str, Any]]] = {}
+
 
 def _get_metadata_path(name: str) -> Path:
     """获取知识库元数据文件路径"""
@@ -19,9 +25,23 @@ def _get_metadata_path(name: str) -> Path:
     return folder.joinpath(f"{name}.json")
 
 
-def _get_db_path(name: str) -> Path:
-    """获取知识库数据库文件路径"""
-    return get_file_path(f"{name}.duckdb")
+def _get_db_folder() -> Path:
+    """获取知识库数据库文件所在目录（与 DuckdbVector 一致）"""
+    return get_folder_path("duckdb_vector")
+
+
+def _read_metadata(path: Path) -> dict[str, Any]:
+    """读取元数据文件，文件未修改时直接返回缓存内容"""
+    mtime: int = path.stat().st_mtime_ns
+
+    cached: tuple[int, dict[str, Any]] | None = _metadata_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    metadata: dict[str, Any] = dict(orjson.loads(path.read_bytes()))
+
+    _metadata_cache[path] = (mtime, metadata)
+    return metadata
 
 
 def list_knowledge_bases() -> list[dict[str, str]]:
@@ -35,18 +55,34 @@ def list_knowledge_bases() -> list[dict[str, str]]:
 
     for f in folder.glob("*.json"):
         try:
-            with open(f, encoding="utf-8") as fp:
-                meta: dict[str, Any] = json.load(fp)
-                result.append({
-                    "name": meta["name"],
-                    "description": meta.get("description", "")
-                })
+            meta: dict[str, Any] = _read_metadata(f)
+            result.append({
+                "name": meta["name"],
+                "description": meta.get("description", "")
+            })
         except Exception:
             pass
 
     return result
 
 
+def get_knowledge_sizes() -> dict[str, int]:
+    """获取所有知识库数据库文件的占用空间
+
+    Returns:
+        知识库名称到字节数的映射（包含 WAL 等附属文件）
+    """
+    sizes: dict[str, int] = {}
+
+    with os.scandir(_get_db_folder()) as it:
+        for entry in it:
+            name, sep, _ = entry.name.partition(".duckdb")
+            if sep:
+                sizes[name] = sizes.get(name, 0) + entry.stat().st_size
+
+    return sizes
+
+
 def create_knowledge_base(
     name: str,
     embedder_type: str,
@@ -73,8 +109,7 @@ def create_knowledge_base(
         "created_at": datetime.now().isoformat()
     }
 
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(metadata, f, indent=4, ensure_ascii=False)
+    path.write_bytes(orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
 
 
 def load_knowledge_base(name: str) -> dict[str, Any] | None:
@@ -91,9 +126,8 @@ def load_knowledge_base(name: str) -> dict[str, Any] | None:
         return None
 
     try:
-        with open(path, encoding="utf-8") as f:
-            return dict(json.load(f))
-    except (json.JSONDecodeError, OSError):
+        return dict(_read_metadata(path))
+    except (orjson.JSONDecodeError, OSError):
         return None
 
 
@@ -104,30 +138,26 @@ def delete_knowledge_base(name: str) -> None:
         name: 知识库名称
     """
     # 删除元数据文件
-    _get_metadata_path(name).unlink(missing_ok=True)
-
-    # 删除数据库文件
-    _get_db_path(name).unlink(missing_ok=True)
+    path: Path = _get_metadata_path(name)
+    path.unlink(missing_ok=True)
+    _metadata_cache.pop(path, None)
 
-    # 删除 WAL 文件
-    wal_path: Path = _get_db_path(name).with_suffix(".duckdb.wal")
-    wal_path.unlink(missing_ok=True)
+    # 一次遍历删除数据库文件及 WAL 等附属文件
+    db_name: str = f"{name}.duckdb"
+    with os.scandir(_get_db_folder()) as it:
+        for entry in it:
+            if entry.name == db_name or entry.name.startswith(db_name + "."):
+                os.unlink(entry.path)
 
 
 def _create_embedder(embedder_type: str, setting: dict[str, Any]) -> BaseEmbedder:
     """根据类型和配置创建 Embedder 实例"""
-    if embedder_type == "OpenAI":
-        from ..embedders.openai_embedder import OpenaiEmbedder
-        return OpenaiEmbedder(**setting)
-    elif embedder_type == "DashScope":
-        from ..embedders.dashscope_embedder import DashscopeEmbedder
-        return DashscopeEmbedder(**setting)
-    elif embedder_type == "Sentence":
-        from ..embedders.sentence_embedder import SentenceEmbedder
-        return SentenceEmbedder(**setting)
-    else:
+    if embedder_type not in get_embedder_names():
         raise ValueError(f"不支持的 Embedder 类型: {embedder_type}")
 
+    embedder_class: type[BaseEmbedder] = get_embedder_class(embedder_type)
+    return embedder_class(**setting)
+
 
 def get_knowledge_vector(name: str) -> DuckdbVector:
     """获取知识库向量存储（自动创建专属 Embedder）
@@ -138,8 +168,6 @@ def get_knowledge_vector(name: str) -> DuckdbVector:
     Returns:
         DuckdbVector 实例
     """
-    from ..vectors.duckdb_vector import DuckdbVector
-
     metadata: dict[str, Any] | None = load_knowledge_base(name)
     if metadata is None:
         raise ValueError(f"知识库 '{name}' 不存在")
@@ -6,7 +6,7 @@ from pathlib import Path
 from typing import TextIO
 
 import qdarkstyle
-from PySide6 import QtGui, QtWidgets, QtCore, QtWebEngineWidgets, QtWebEngineCore
+from PySide6 import QtGui, QtWidgets, QtCore, QtWebEngineWidgets, QtWebEngineCore, QtWebChannel
 
 from ..utility import TEMP_DIR
 from .setting import load_font_family, load_font_size
@@ -56,4 +56,5 @@ __all__ = [
     "QtWidgets",
     "QtWebEngineWidgets",
     "QtWebEngineCore",
+    "QtWebChannel",
 ]
@@ -1,7 +1,8 @@
-import json
 from pathlib import Path
 from typing import Any, cast
 
+import orjson
+
 from ..utility import TEMP_DIR
 
 
@@ -15,16 +16,14 @@ def _load_settings() -> dict[str, Any]:
         return {}
 
     try:
-        with open(SETTING_FILEPATH, encoding="utf-8") as f:
-            return cast(dict[str, Any], json.load(f))
-    except (json.JSONDecodeError, OSError):
+        return cast(dict[str, Any], orjson.loads(SETTING_FILEPATH.read_bytes()))
+    except (orjson.JSONDecodeError, OSError):
         return {}
 
 
 def _save_settings(data: dict[str, Any]) -> None:
     """保存所有设置"""
-    with open(SETTING_FILEPATH, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+    SETTING_FILEPATH.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
 
 
 def get_setting(key: str, default: Any = None) -> Any:
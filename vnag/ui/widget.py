@@ -1,18 +1,18 @@
+import html
 import json
-import os
 import re
 import uuid
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 from collections.abc import Callable
 from pathlib import Path
-from typing import cast, NamedTuple
+from typing import cast, NamedTuple, TYPE_CHECKING
 
 from ..constant import Role
 from ..engine import AgentEngine, default_profile
-from ..object import ToolSchema, Segment
+from ..object import ToolSchema
 from ..agent import Profile, TaskAgent
-from ..utility import read_text_file
-from ..gateways import GATEWAY_CLASSES, get_gateway_class
+from ..utility import format_size
+from ..gateways import get_gateway_names, get_gateway_class
 from ..embedders import get_embedder_names, get_embedder_class
 from ..embedder import BaseEmbedder
 
@@ -21,9 +21,10 @@ from .qt import (
     QtGui,
     QtWidgets,
     QtWebEngineCore,
-    QtWebEngineWidgets
+    QtWebEngineWidgets,
+    QtWebChannel
 )
-from .worker import StreamWorker
+from .worker import StreamSignals, StreamWorker, ImportWorker, get_stream_pool
 from .setting import (
     load_favorite_models,
     save_favorite_models,
@@ -38,9 +39,12 @@ from .factory import (
     save_gateway_setting,
 )
 
+if TYPE_CHECKING:
+    from ..vectors.duckdb_vector import DuckdbVector
+
 
 class QueuedMessage(NamedTuple):
-    """消息队列中的消息结构"""
+    """待显示到会话历史中的消息结构"""
     role: Role
     content: str
     thinking: str
@@ -48,9 +52,66 @@ class QueuedMessage(NamedTuple):
     output_tokens: int
 
 
+CHAT_HTML_PATH: Path = Path(__file__).parent.joinpath("resources", "chat.html")
+CHAT_HTML_URL: QtCore.QUrl = QtCore.QUrl.fromLocalFile(str(CHAT_HTML_PATH))
+
+_chat_html: QtCore.QByteArray | None = None
+
+
+def get_chat_html() -> QtCore.QByteArray:
+    """获取聊天页面内容，所有会话历史控件共用"""
+    global _chat_html
+
+    if _chat_html is None:
+        _chat_html = QtCore.QByteArray(CHAT_HTML_PATH.read_bytes())
+
+    return _chat_html
+
+
+class HistoryBridge(QtCore.QObject):
+    """
+    通过 QWebChannel 暴露给聊天页面的通信对象
+
+    页面端连接以下信号完成渲染，参数直接以 Qt 类型传递，无需拼接和解析脚本。
+    """
+    # 页面端完成 QWebChannel 初始化
+    ready: QtCore.Signal = QtCore.Signal()
+
+    # 重新渲染全部会话历史 (messages, name)，消息列表由 QWebChannel 直接转换为页面端数组
+    history_rendered: QtCore.Signal = QtCore.Signal(list, str)
+
+    # 移除最后一轮对话
+    last_round_removed: QtCore.Signal = QtCore.Signal()
+
+    # 添加用户消息 (content)
+    user_appended: QtCore.Signal = QtCore.Signal(str)
+
+    # 添加助手消息 (content, name, thinking, input_tokens, output_tokens)
+    assistant_appended: QtCore.Signal = QtCore.Signal(str, str, str, int, int)
+
+    # 开始流式消息 (msg_id, name)
+    stream_started: QtCore.Signal = QtCore.Signal(str, str)
+
+    # 流式 content 增量 (msg_id, delta)
+    content_appended: QtCore.Signal = QtCore.Signal(str, str)
+
+    # 流式 thinking 增量 (msg_id, delta)
+    thinking_appended: QtCore.Signal = QtCore.Signal(str, str)
+
+    # 结束流式消息 (msg_id, input_tokens, output_tokens)
+    stream_finished: QtCore.Signal = QtCore.Signal(str, int, int)
+
+    @QtCore.Slot()
+    def notify_ready(self) -> None:
+        """页面端初始化完成后调用"""
+        self.ready.emit()
+
+
 class HistoryWidget(QtWebEngineWidgets.QWebEngineView):
     """会话历史控件"""
 
+    FLUSH_INTERVAL: int = 33  # 流式内容刷新到页面的间隔（毫秒）
+
     def __init__(self,  profile_name: str, parent: QtWidgets.QWidget | None = None) -> None:
         """构造函数"""
         super().__init__(parent)
@@ -66,6 +127,15 @@ class HistoryWidget(QtWebEngineWidgets.QWebEngineView):
         self.msg_id: str = ""
         self.last_type: str = ""
 
+        # 尚未发送到页面的增量内容，由定时器合并后统一发送
+        self.pending_content: list[str] = []
+        self.pending_thinking: list[str] = []
+
+        self.flush_timer: QtCore.QTimer = QtCore.QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(self.FLUSH_INTERVAL)
+        self.flush_timer.timeout.connect(self.flush_stream)
+
         # 流式请求的 Token 使用量
         self.stream_input_tokens: int = 0
         self.stream_output_tokens: int = 0
@@ -74,8 +144,13 @@ class HistoryWidget(QtWebEngineWidgets.QWebEngineView):
         self.page_loaded: bool = False
         self.message_queue: list[QueuedMessage] = []
 
-        # 连接页面加载完成信号
-        self.page().loadFinished.connect(self._on_load_finished)
+        # 通过 QWebChannel 与页面通信，页面就绪后处理消息队列
+        self.bridge: HistoryBridge = HistoryBridge(self)
+        self.bridge.ready.connect(self._on_page_ready)
+
+        self.channel: QtWebChannel.QWebChannel = QtWebChannel.QWebChannel(self)
+        self.channel.registerObject("bridge", self.bridge)
+        self.page().setWebChannel(self.channel)
 
         # 连接权限请求信号，处理剪贴板权限
         self.page().permissionRequested.connect(self._on_permission_requested)
@@ -87,10 +162,8 @@ class HistoryWidget(QtWebEngineWidgets.QWebEngineView):
         # 连接缩放变化信号，自动保存缩放倍数
         self.page().zoomFactorChanged.connect(self._on_zoom_factor_changed)
 
-        # 加载本地HTML文件
-        current_path: str = os.path.dirname(os.path.abspath(__file__))
-        html_path: str = os.path.join(current_path, "resources", "chat.html")
-        self.load(QtCore.QUrl.fromLocalFile(html_path))
+        # 加载本地HTML页面（页面内容只读取一次）
+        self.setContent(get_chat_html(), "text/html", CHAT_HTML_URL)
 
     def _on_permission_requested(self, permission: QtWebEngineCore.QWebEnginePermission) -> None:
         """处理权限请求，自动授予剪贴板权限"""
@@ -101,40 +174,67 @@ class HistoryWidget(QtWebEngineWidgets.QWebEngineView):
         """处理缩放倍数变化，自动保存"""
         save_zoom_factor(zoom_factor)
 
-    def _on_load_finished(self, success: bool) -> None:
-        """页面加载完成后的回调"""
-        if not success:
-            return
+    def _on_page_ready(self) -> None:
+        """页面及 QWebChannel 初始化完成后的回调"""
+        # 设置页面加载完成标志，并一次性渲染消息队列
+        self.page_loaded = True
 
-        self._show_welcome_message()
+        messages: list[QueuedMessage] = self.message_queue
+        self.message_queue = []
+        self.set_history(messages)
 
-        # 设置页面加载完成标志，并处理消息队列
-        self.page_loaded = True
+    def _escape_content(self, content: str) -> str:
+        """转义用户消息，用户消息不做 Markdown 渲染"""
+        return html.escape(content, quote=False).replace("\n", "<br>")
 
-        for msg in self.message_queue:
-            self.append_message(
-                msg.role,
-                msg.content,
-                msg.thinking,
-                msg.input_tokens,
-                msg.output_tokens
-            )
+    def set_history(self, messages: list[QueuedMessage]) -> None:
+        """
+        替换全部会话历史（包含助手欢迎消息）
+
+        所有消息打包为一次页面调用，由页面端批量构建后一次性插入。
+        """
+        # 如果页面未加载完成，则替换消息队列
+        if not self.page_loaded:
+            self.message_queue = list(messages)
+            return
+
+        welcome: QueuedMessage = QueuedMessage(
+            role=Role.ASSISTANT,
+            content=f"你好，我是{self.profile_name}，有什么能帮上你的吗？",
+            thinking="",
+            input_tokens=0,
+            output_tokens=0
+        )
 
-        self.message_queue.clear()
+        data: list[dict] = []
+        for msg in [welcome, *messages]:
+            if msg.role is Role.USER:
+                data.append({"role": msg.role.value, "content": self._escape_content(msg.content)})
+            else:
+                data.append({
+                    "role": msg.role.value,
+                    "content": msg.content,
+                    "thinking": msg.thinking,
+                    "input_tokens": msg.input_tokens,
+                    "output_tokens": msg.output_tokens,
+                })
 
-    def _show_welcome_message(self) -> None:
-        """显示助手欢迎消息"""
-        js_content: str = json.dumps(f"你好，我是{self.profile_name}，有什么能帮上你的吗？")
-        js_name: str = json.dumps(self.profile_name)
-        self.page().runJavaScript(f"appendAssistantMessage({js_content}, {js_name})")
+        self.bridge.history_rendered.emit(data, self.profile_name)
 
     def clear(self) -> None:
         """清空会话历史"""
+        self.set_history([])
+
+    def remove_last_round(self) -> None:
+        """移除最后一轮对话（最后一条用户消息及其后的助手消息）"""
         if self.page_loaded:
-            self.page().runJavaScript("document.getElementById('history').innerHTML = '';")
-            self._show_welcome_message()
-        else:
-            self.message_queue.clear()
+            self.bridge.last_round_removed.emit()
+            return
+
+        for i in range(len(self.message_queue) - 1, -1, -1):
+            if self.message_queue[i].role is Role.USER:
+                del self.message_queue[i:]
+                break
 
     def append_message(
         self,
@@ -158,29 +258,20 @@ class HistoryWidget(QtWebEngineWidgets.QWebEngineView):
 
         # 用户消息，不需要被渲染
         if role is Role.USER:
-            escaped_content: str = (
-                content.replace("&", "&amp;")
-                .replace("<", "&lt;")
-                .replace(">", "&gt;")
-                .replace("\n", "<br>")
-            )
-
-            js_content: str = json.dumps(escaped_content)
-
-            self.page().runJavaScript(f"appendUserMessage({js_content})")
+            self.bridge.user_appended.emit(self._escape_content(content))
         # AI消息，需要被渲染
         elif role is Role.ASSISTANT:
-            js_content = json.dumps(content)
-            js_name: str = json.dumps(self.profile_name)
-            js_thinking: str = json.dumps(thinking)
-            self.page().runJavaScript(
-                f"appendAssistantMessage({js_content}, {js_name}, {js_thinking}, "
-                f"{input_tokens}, {output_tokens})"
+            self.bridge.assistant_appended.emit(
+                content, self.profile_name, thinking, input_tokens, output_tokens
             )
 
     def start_stream(self) -> None:
         """开始新的流式输出"""
         # 清空当前流式输出内容和消息ID
+        self.flush_timer.stop()
+        self.pending_content.clear()
+        self.pending_thinking.clear()
+
         self.full_content = ""
         self.full_thinking = ""
         self.msg_id = f"msg-{uuid.uuid4().hex}"
@@ -190,41 +281,56 @@ class HistoryWidget(QtWebEngineWidgets.QWebEngineView):
         self.stream_input_tokens = 0
         self.stream_output_tokens = 0
 
-        # 调用前端函数，开始新的流式输出
-        js_name: str = json.dumps(self.profile_name)
-        self.page().runJavaScript(f"startAssistantMessage('{self.msg_id}', {js_name})")
+        # 通知前端开始新的流式输出
+        self.bridge.stream_started.emit(self.msg_id, self.profile_name)
 
     def update_content(self, content_delta: str) -> None:
         """更新流式输出（content 内容）"""
         # 记录当前类型为 content
         self.last_type = "content"
 
-        # 累积收到的内容
+        # 累积收到的内容，增量部分等待定时器统一发送到页面
         self.full_content += content_delta
+        self.pending_content.append(content_delta)
 
-        # 将内容转换为JSON字符串
-        js_content: str = json.dumps(self.full_content)
-
-        # 调用前端函数，更新流式输出
-        self.page().runJavaScript(f"updateAssistantMessage('{self.msg_id}', {js_content})")
+        if not self.flush_timer.isActive():
+            self.flush_timer.start()
 
     def update_thinking(self, thinking_delta: str) -> None:
         """更新流式输出（thinking 内容）"""
         # 如果之前输出过其他类型的内容（如content），且已有thinking内容，则换行
         if self.last_type and self.last_type != "thinking" and self.full_thinking:
             self.full_thinking += "\n\n"
+            self.pending_thinking.append("\n\n")
 
         # 记录当前类型为 thinking
         self.last_type = "thinking"
 
-        # 累积收到的 thinking 内容
+        # 累积收到的 thinking 内容，增量部分等待定时器统一发送到页面
         self.full_thinking += thinking_delta
+        self.pending_thinking.append(thinking_delta)
+
+        if not self.flush_timer.isActive():
+            self.flush_timer.start()
 
-        # 将内容转换为JSON字符串
-        js_thinking: str = json.dumps(self.full_thinking)
+    def flush_stream(self) -> None:
+        """
+        将累积的增量内容发送到页面
 
-        # 调用前端函数，更新 thinking 输出
-        self.page().runJavaScript(f"updateThinking('{self.msg_id}', {js_thinking})")
+        每个刷新周期最多各调用一次前端函数，且只传输新增部分，
+        完整内容由前端自行拼接。
+        """
+        self.flush_timer.stop()
+
+        if self.pending_thinking:
+            thinking_delta: str = "".join(self.pending_thinking)
+            self.pending_thinking.clear()
+            self.bridge.thinking_appended.emit(self.msg_id, thinking_delta)
+
+        if self.pending_content:
+            content_delta: str = "".join(self.pending_content)
+            self.pending_content.clear()
+            self.bridge.content_appended.emit(self.msg_id, content_delta)
 
     def update_usage(self, input_tokens: int, output_tokens: int) -> None:
         """更新流式输出的 Token 使用量"""
@@ -233,16 +339,44 @@ class HistoryWidget(QtWebEngineWidgets.QWebEngineView):
 
     def finish_stream(self) -> str:
         """结束流式输出"""
-        # 调用前端函数，结束流式输出（传入 Token 使用量）
-        self.page().runJavaScript(
-            f"finishAssistantMessage('{self.msg_id}', "
-            f"{self.stream_input_tokens}, {self.stream_output_tokens})"
+        # 先刷新尚未显示的内容
+        self.flush_stream()
+
+        # 通知前端结束流式输出（传入 Token 使用量）
+        self.bridge.stream_finished.emit(
+            self.msg_id, self.stream_input_tokens, self.stream_output_tokens
         )
 
         # 返回完整的流式输出内容
         return self.full_content
 
 
+def build_markdown_text(agent: TaskAgent) -> str:
+    """生成会话的 Markdown 纯文本（仅用户与助手的正文 content，不含思考与工具信息）"""
+    parts: list[str] = [f"# {agent.name}\n\n"]
+    assistant_content: str = ""
+
+    for message in agent.messages:
+        if message.role is Role.SYSTEM:
+            continue
+        elif message.role is Role.USER:
+            if message.content:
+                if assistant_content:
+                    parts.append(f"## 助手\n\n{assistant_content}\n\n")
+                    assistant_content = ""
+                parts.append(f"## 用户\n\n{message.content}\n\n")
+            else:
+                continue
+        elif message.role is Role.ASSISTANT:
+            if message.content:
+                assistant_content += message.content
+
+    if assistant_content:
+        parts.append(f"## 助手\n\n{assistant_content}\n\n")
+
+    return "".join(parts).rstrip() + "\n"
+
+
 class AgentWidget(QtWidgets.QWidget):
     """会话控件"""
 
@@ -251,6 +385,7 @@ class AgentWidget(QtWidgets.QWidget):
         engine: AgentEngine,
         agent: TaskAgent,
         update_list: Callable[[], None],
+        favorite_models: list[str],
         parent: QtWidgets.QWidget | None = None
     ) -> None:
         """构造函数"""
@@ -262,9 +397,23 @@ class AgentWidget(QtWidgets.QWidget):
         self.update_list: Callable[[], None] = update_list
 
         self.init_ui()
-        self.load_favorite_models()
+        self.init_signals()
+        self.load_favorite_models(favorite_models)
         self.display_history()
 
+    def init_signals(self) -> None:
+        """创建流式请求信号对象，所有请求共用并只连接一次"""
+        self.stream_signals: StreamSignals = StreamSignals(self)
+        self.stream_signals.content.connect(self.on_stream_content)
+        self.stream_signals.thinking.connect(self.on_stream_thinking)
+        self.stream_signals.usage.connect(self.on_stream_usage)
+        self.stream_signals.finished.connect(self.on_stream_finished)
+        self.stream_signals.error.connect(self.on_stream_error)
+        self.stream_signals.title.connect(self.on_title_generated)
+        self.stream_signals.tool_start.connect(self.on_tool_start)
+        self.stream_signals.tool_end.connect(self.on_tool_end)
+        self.stream_signals.warning.connect(self.on_warning)
+
     def init_ui(self) -> None:
         """初始化UI"""
         desktop: QtCore.QRect = QtWidgets.QApplication.primaryScreen().availableGeometry()
@@ -323,7 +472,7 @@ class AgentWidget(QtWidgets.QWidget):
 
     def display_history(self) -> None:
         """显示当前会话的聊天记录"""
-        self.history_widget.clear()
+        messages: list[QueuedMessage] = []
 
         assistant_content: str = ""
         assistant_thinking: str = ""
@@ -341,13 +490,13 @@ class AgentWidget(QtWidgets.QWidget):
                 if message.content:
                     # 如果助手内容不为空，则先显示助手内容（包含之前的工具调用记录）
                     if assistant_content:
-                        self.history_widget.append_message(
+                        messages.append(QueuedMessage(
                             Role.ASSISTANT,
                             assistant_content,
                             assistant_thinking,
                             assistant_input_tokens,
                             assistant_output_tokens
-                        )
+                        ))
                         assistant_content = ""
                         assistant_thinking = ""
                         assistant_input_tokens = 0
@@ -355,7 +504,7 @@ class AgentWidget(QtWidgets.QWidget):
                         last_type = ""
 
                     # 显示用户内容
-                    self.history_widget.append_message(Role.USER, message.content)
+                    messages.append(QueuedMessage(Role.USER, message.content, "", 0, 0))
                 # 没有内容（工具调用结果返回），则跳过
                 else:
                     continue
@@ -387,40 +536,18 @@ class AgentWidget(QtWidgets.QWidget):
 
         # 显示消息
         if assistant_content:
-            self.history_widget.append_message(
+            messages.append(QueuedMessage(
                 Role.ASSISTANT,
                 assistant_content,
                 assistant_thinking,
                 assistant_input_tokens,
                 assistant_output_tokens
-            )
-
-        self.update_buttons()
-
-    def build_markdown_text(self) -> str:
-        """生成会话的 Markdown 纯文本（仅用户与助手的正文 content，不含思考与工具信息）"""
-        parts: list[str] = [f"# {self.agent.name}\n\n"]
-        assistant_content: str = ""
-
-        for message in self.agent.messages:
-            if message.role is Role.SYSTEM:
-                continue
-            elif message.role is Role.USER:
-                if message.content:
-                    if assistant_content:
-                        parts.append(f"## 助手\n\n{assistant_content}\n\n")
-                        assistant_content = ""
-                    parts.append(f"## 用户\n\n{message.content}\n\n")
-                else:
-                    continue
-            elif message.role is Role.ASSISTANT:
-                if message.content:
-                    assistant_content += message.content
+            ))
 
-        if assistant_content:
-            parts.append(f"## 助手\n\n{assistant_content}\n\n")
+        # 一次性渲染全部消息
+        self.history_widget.set_history(messages)
 
-        return "".join(parts).rstrip() + "\n"
+        self.update_buttons()
 
     def send_message(self) -> None:
         """发送消息"""
@@ -457,19 +584,9 @@ class AgentWidget(QtWidgets.QWidget):
         self.resend_button.setEnabled(False)
         self.delete_button.setEnabled(False)
 
-        worker: StreamWorker = StreamWorker(self.agent, text)
-        worker.signals.content.connect(self.on_stream_content)
-        worker.signals.thinking.connect(self.on_stream_thinking)
-        worker.signals.usage.connect(self.on_stream_usage)
-        worker.signals.finished.connect(self.on_stream_finished)
-        worker.signals.error.connect(self.on_stream_error)
-        worker.signals.title.connect(self.on_title_generated)
-        worker.signals.tool_start.connect(self.on_tool_start)
-        worker.signals.tool_end.connect(self.on_tool_end)
-        worker.signals.warning.connect(self.on_warning)
-
+        worker: StreamWorker = StreamWorker(self.agent, text, self.stream_signals)
         self.worker = worker
-        QtCore.QThreadPool.globalInstance().start(worker)
+        get_stream_pool().start(worker)
 
     def stop_stream(self) -> None:
         """停止当前流式请求"""
@@ -478,17 +595,25 @@ class AgentWidget(QtWidgets.QWidget):
 
     def delete_round(self) -> None:
         """删除最后一轮对话"""
+        if not self.agent.round_prompt:
+            return
+
         self.agent.delete_round()
-        self.display_history()
+
+        # 只移除页面中的最后一轮，无需重新渲染全部历史
+        self.history_widget.remove_last_round()
+        self.update_buttons()
 
     def resend_round(self) -> None:
         """重新发送最后一轮对话"""
-        prompt: str = self.agent.pop_round()
+        if not self.agent.round_prompt:
+            return
 
-        if prompt:
-            self.input_widget.setText(prompt)
+        prompt: str = self.agent.pop_round()
+        self.input_widget.setPlainText(prompt)
 
-        self.display_history()
+        self.history_widget.remove_last_round()
+        self.update_buttons()
 
     def update_buttons(self) -> None:
         """更新功能按钮状态"""
@@ -569,20 +694,14 @@ class AgentWidget(QtWidgets.QWidget):
         if model:
             self.agent.set_model(model)
 
-    def load_favorite_models(self) -> None:
-        """加载常用模型"""
+    def load_favorite_models(self, favorite_models: list[str]) -> None:
+        """加载常用模型（由主窗口统一读取并过滤）"""
         current_text: str = self.model_combo.currentText()
 
         # 阻止信号重复触发on_model_changed
         self.model_combo.blockSignals(True)
 
         self.model_combo.clear()
-        favorite_models: list[str] = load_favorite_models()
-
-        # 仅显示当前网关支持的模型
-        available_models: set[str] = set(self.engine.list_models())
-        favorite_models = [m for m in favorite_models if m in available_models]
-
         self.model_combo.addItems(favorite_models)
 
         # 恢复之前的选项
@@ -770,59 +889,58 @@ class ProfileDialog(QtWidgets.QDialog):
 
     def populate_tree(self) -> None:
         """填充工具树"""
-        self.tool_tree.clear()
+        # 先构建脱离控件的节点，最后一次性添加，避免逐个插入触发刷新
+        roots: list[QtWidgets.QTreeWidgetItem] = []
 
         # 添加本地工具
         local_tools: dict[str, ToolSchema] = self.engine.get_local_schemas()
         if local_tools:
-            local_root = QtWidgets.QTreeWidgetItem(self.tool_tree, ["本地工具"])
-
-            module_tools: dict[str, list[ToolSchema]] = defaultdict(list)
-            for schema in local_tools.values():
-                module, _ = schema.name.split("_", 1)
-                module_tools[module].append(schema)
-
-            for module, schemas in sorted(module_tools.items()):
-                module_item = QtWidgets.QTreeWidgetItem(local_root, [module])
-                module_item.setFlags(
-                    module_item.flags()
-                    | QtCore.Qt.ItemFlag.ItemIsUserCheckable
-                    | QtCore.Qt.ItemFlag.ItemIsAutoTristate
-                )
-                module_item.setCheckState(0, QtCore.Qt.CheckState.Unchecked)
-
-                for schema in sorted(schemas, key=lambda s: s.name):
-                    tool_item = QtWidgets.QTreeWidgetItem(module_item, [schema.name])
-                    tool_item.setFlags(tool_item.flags() | QtCore.Qt.ItemFlag.ItemIsUserCheckable)
-                    tool_item.setCheckState(0, QtCore.Qt.CheckState.Unchecked)
-                    tool_item.setData(0, QtCore.Qt.ItemDataRole.UserRole, schema.name)
+            roots.append(self._build_tool_group("本地工具", local_tools))
 
         # 添加MCP工具
         mcp_tools: dict[str, ToolSchema] = self.engine.get_mcp_schemas()
         if mcp_tools:
-            mcp_root = QtWidgets.QTreeWidgetItem(self.tool_tree, ["MCP工具"])
-
-            server_tools: dict[str, list[ToolSchema]] = defaultdict(list)
-            for schema in mcp_tools.values():
-                server, _ = schema.name.split("_", 1)
-                server_tools[server].append(schema)
-
-            for server, schemas in sorted(server_tools.items()):
-                server_item = QtWidgets.QTreeWidgetItem(mcp_root, [server])
-                server_item.setFlags(
-                    server_item.flags()
-                    | QtCore.Qt.ItemFlag.ItemIsUserCheckable
-                    | QtCore.Qt.ItemFlag.ItemIsAutoTristate
-                )
-                server_item.setCheckState(0, QtCore.Qt.CheckState.Unchecked)
-
-                for schema in sorted(schemas, key=lambda s: s.name):
-                    tool_item = QtWidgets.QTreeWidgetItem(server_item, [schema.name])
-                    tool_item.setFlags(tool_item.flags() | QtCore.Qt.ItemFlag.ItemIsUserCheckable)
-                    tool_item.setCheckState(0, QtCore.Qt.CheckState.Unchecked)
-                    tool_item.setData(0, QtCore.Qt.ItemDataRole.UserRole, schema.name)
+            roots.append(self._build_tool_group("MCP工具", mcp_tools))
 
+        self.tool_tree.setUpdatesEnabled(False)
+        self.tool_tree.clear()
+        self.tool_tree.addTopLevelItems(roots)
         self.tool_tree.expandAll()
+        self.tool_tree.setUpdatesEnabled(True)
+
+    def _build_tool_group(self, title: str, tools: dict[str, ToolSchema]) -> QtWidgets.QTreeWidgetItem:
+        """构建按模块（或服务器）分组的工具节点"""
+        root: QtWidgets.QTreeWidgetItem = QtWidgets.QTreeWidgetItem([title])
+
+        group_tools: dict[str, list[ToolSchema]] = defaultdict(list)
+        for schema in tools.values():
+            group, _ = schema.name.split("_", 1)
+            group_tools[group].append(schema)
+
+        group_items: list[QtWidgets.QTreeWidgetItem] = []
+
+        for group, schemas in sorted(group_tools.items()):
+            group_item: QtWidgets.QTreeWidgetItem = QtWidgets.QTreeWidgetItem([group])
+            group_item.setFlags(
+                group_item.flags()
+                | QtCore.Qt.ItemFlag.ItemIsUserCheckable
+                | QtCore.Qt.ItemFlag.ItemIsAutoTristate
+            )
+            group_item.setCheckState(0, QtCore.Qt.CheckState.Unchecked)
+
+            tool_items: list[QtWidgets.QTreeWidgetItem] = []
+            for schema in sorted(schemas, key=lambda s: s.name):
+                tool_item: QtWidgets.QTreeWidgetItem = QtWidgets.QTreeWidgetItem([schema.name])
+                tool_item.setFlags(tool_item.flags() | QtCore.Qt.ItemFlag.ItemIsUserCheckable)
+                tool_item.setCheckState(0, QtCore.Qt.CheckState.Unchecked)
+                tool_item.setData(0, QtCore.Qt.ItemDataRole.UserRole, schema.name)
+                tool_items.append(tool_item)
+
+            group_item.addChildren(tool_items)
+            group_items.append(group_item)
+
+        root.addChildren(group_items)
+        return root
 
     def new_profile(self) -> None:
         """新建智能体配置"""
@@ -1041,67 +1159,58 @@ class ToolDialog(QtWidgets.QDialog):
 
     def populate_tree(self) -> None:
         """填充树"""
-        self.tree_widget.clear()
+        # 先构建脱离控件的节点，最后一次性添加，避免逐个插入触发刷新
+        roots: list[QtWidgets.QTreeWidgetItem] = []
 
         # 添加本地工具
         local_tools: dict[str, ToolSchema] = self._engine.get_local_schemas()
         if local_tools:
-            local_root: QtWidgets.QTreeWidgetItem = QtWidgets.QTreeWidgetItem(
-                self.tree_widget,
-                ["本地工具", "", ""]
-            )
-
-            module_tools: dict[str, list[ToolSchema]] = defaultdict(list)
-            for schema in local_tools.values():
-                module, _ = schema.name.split("_", 1)
-                module_tools[module].append(schema)
-
-            for module, schemas in sorted(module_tools.items()):
-                module_item: QtWidgets.QTreeWidgetItem = QtWidgets.QTreeWidgetItem(
-                    local_root,
-                    ["", module, ""]
-                )
-                for schema in sorted(schemas, key=lambda s: s.name):
-                    _, name = schema.name.split("_", 1)
-                    item: QtWidgets.QTreeWidgetItem = QtWidgets.QTreeWidgetItem(
-                        module_item,
-                        ["", "", name]
-                    )
-                    item.setData(0, QtCore.Qt.ItemDataRole.UserRole, schema)
-
-            self.tree_widget.expandItem(local_root)
+            roots.append(self._build_tool_group("本地工具", local_tools))
 
         # 添加MCP工具
         mcp_tools: dict[str, ToolSchema] = self._engine.get_mcp_schemas()
         if mcp_tools:
-            mcp_root: QtWidgets.QTreeWidgetItem = QtWidgets.QTreeWidgetItem(
-                self.tree_widget,
-                ["MCP工具", "", ""]
-            )
-
-            server_tools: dict[str, list[ToolSchema]] = defaultdict(list)
-            for schema in mcp_tools.values():
-                server, _ = schema.name.split("_", 1)
-                server_tools[server].append(schema)
+            roots.append(self._build_tool_group("MCP工具", mcp_tools))
 
-            for server, schemas in sorted(server_tools.items()):
-                server_item: QtWidgets.QTreeWidgetItem = QtWidgets.QTreeWidgetItem(
-                    mcp_root,
-                    ["", server, ""]
-                )
-                for schema in sorted(schemas, key=lambda s: s.name):
-                    _, name = schema.name.split("_", 1)
-                    item = QtWidgets.QTreeWidgetItem(
-                        server_item,
-                        ["", "", name]
-                    )
-                    item.setData(0, QtCore.Qt.ItemDataRole.UserRole, schema)
+        self.tree_widget.setUpdatesEnabled(False)
+        self.tree_widget.clear()
+        self.tree_widget.addTopLevelItems(roots)
 
-            self.tree_widget.expandItem(mcp_root)
+        for root in roots:
+            self.tree_widget.expandItem(root)
 
         for i in range(self.tree_widget.columnCount()):
             self.tree_widget.resizeColumnToContents(i)
 
+        self.tree_widget.setUpdatesEnabled(True)
+
+    def _build_tool_group(self, title: str, tools: dict[str, ToolSchema]) -> QtWidgets.QTreeWidgetItem:
+        """构建按模块（或服务器）分组的工具节点"""
+        root: QtWidgets.QTreeWidgetItem = QtWidgets.QTreeWidgetItem([title, "", ""])
+
+        group_tools: dict[str, list[ToolSchema]] = defaultdict(list)
+        for schema in tools.values():
+            group, _ = schema.name.split("_", 1)
+            group_tools[group].append(schema)
+
+        group_items: list[QtWidgets.QTreeWidgetItem] = []
+
+        for group, schemas in sorted(group_tools.items()):
+            group_item: QtWidgets.QTreeWidgetItem = QtWidgets.QTreeWidgetItem(["", group, ""])
+
+            tool_items: list[QtWidgets.QTreeWidgetItem] = []
+            for schema in sorted(schemas, key=lambda s: s.name):
+                _, name = schema.name.split("_", 1)
+                item: QtWidgets.QTreeWidgetItem = QtWidgets.QTreeWidgetItem(["", "", name])
+                item.setData(0, QtCore.Qt.ItemDataRole.UserRole, schema)
+                tool_items.append(item)
+
+            group_item.addChildren(tool_items)
+            group_items.append(group_item)
+
+        root.addChildren(group_items)
+        return root
+
     def on_item_clicked(self, item: QtWidgets.QTreeWidgetItem, column: int) -> None:
         """处理项目点击事件"""
         schema: ToolSchema | None = item.data(0, QtCore.Qt.ItemDataRole.UserRole)
@@ -1112,7 +1221,7 @@ class ToolDialog(QtWidgets.QDialog):
                 f"[描述]\n{schema.description}\n\n"
                 f"[参数]\n{json.dumps(schema.parameters, indent=4, ensure_ascii=False)}"
             )
-            self.detail_widget.setText(text)
+            self.detail_widget.setPlainText(text)
 
     def show_context_menu(self, pos: QtCore.QPoint) -> None:
         """显示右键菜单"""
@@ -1280,11 +1389,8 @@ class ModelDialog(QtWidgets.QDialog):
         if not model_name:
             return
 
-        current_models: list[str] = [
-            self.favorite_list.item(i).text()
-            for i in range(self.favorite_list.count())
-        ]
-        if model_name not in current_models:
+        # 由列表控件直接查找，无需逐项构建 Python 列表
+        if not self.favorite_list.findItems(model_name, QtCore.Qt.MatchFlag.MatchExactly):
             self.favorite_list.addItem(model_name)
 
     def remove_model(self) -> None:
@@ -1390,7 +1496,7 @@ class GatewayDialog(QtWidgets.QDialog):
 
         self.type_combo: QtWidgets.QComboBox = QtWidgets.QComboBox()
         self.type_combo.setFixedWidth(300)
-        self.type_combo.addItems(sorted(GATEWAY_CLASSES.keys()))
+        self.type_combo.addItems(sorted(get_gateway_names()))
         self.type_combo.currentTextChanged.connect(self.on_type_changed)
 
         type_hbox: QtWidgets.QHBoxLayout = QtWidgets.QHBoxLayout()
@@ -1425,7 +1531,7 @@ class GatewayDialog(QtWidgets.QDialog):
 
     def init_gateway_pages(self) -> None:
         """预先创建所有 Gateway 的配置页面"""
-        for gateway_type in sorted(GATEWAY_CLASSES.keys()):
+        for gateway_type in sorted(get_gateway_names()):
             gateway_cls = get_gateway_class(gateway_type)
             if not gateway_cls:
                 continue
@@ -1476,7 +1582,7 @@ class GatewayDialog(QtWidgets.QDialog):
         """加载当前配置"""
         gateway_type: str = load_gateway_type()
 
-        if gateway_type and gateway_type in GATEWAY_CLASSES:
+        if gateway_type and gateway_type in get_gateway_names():
             self.type_combo.setCurrentText(gateway_type)
         else:
             # 默认选择第一个
@@ -1652,8 +1758,16 @@ class KnowledgeImportDialog(QtWidgets.QDialog):
         """构造函数"""
         super().__init__(parent)
         self.kb_name: str = kb_name
+        self.worker: ImportWorker | None = None
+
+        # 导入为长时间任务，使用独立线程池，避免占用全局线程池
+        self.thread_pool: QtCore.QThreadPool = QtCore.QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(1)
+
         self.init_ui()
 
+        self.finished.connect(self.stop_import)
+
     def init_ui(self) -> None:
         """初始化UI"""
         self.setWindowTitle(f"导入到: {self.kb_name}")
@@ -1677,6 +1791,10 @@ class KnowledgeImportDialog(QtWidgets.QDialog):
         self.chunk_spin.setRange(100, 100000)
         self.chunk_spin.setValue(2000)
 
+        self.worker_spin: QtWidgets.QSpinBox = QtWidgets.QSpinBox()
+        self.worker_spin.setRange(1, 16)
+        self.worker_spin.setValue(4)
+
         self.status: QtWidgets.QLabel = QtWidgets.QLabel("就绪")
 
         self.import_button: QtWidgets.QPushButton = QtWidgets.QPushButton("导入")
@@ -1694,6 +1812,7 @@ class KnowledgeImportDialog(QtWidgets.QDialog):
         form.addRow("文件", file_layout)
         form.addRow("", self.full_check)
         form.addRow("块大小", self.chunk_spin)
+        form.addRow("并发请求", self.worker_spin)
 
         main_vbox: QtWidgets.QVBoxLayout = QtWidgets.QVBoxLayout(self)
         main_vbox.addLayout(form)
@@ -1715,9 +1834,6 @@ class KnowledgeImportDialog(QtWidgets.QDialog):
 
     def do_import(self) -> None:
         """执行导入"""
-        from .knowledge import get_knowledge_vector
-        from ..segmenters.markdown_segmenter import MarkdownSegmenter
-
         filepath: str = self.file_edit.text()
         if not filepath or not Path(filepath).exists():
             QtWidgets.QMessageBox.warning(self, "错误", "请选择有效文件")
@@ -1725,42 +1841,76 @@ class KnowledgeImportDialog(QtWidgets.QDialog):
 
         self.import_button.setEnabled(False)
         self.status.setText("处理中...")
-        QtWidgets.QApplication.processEvents()
 
-        text: str = read_text_file(Path(filepath))
-        source: str = Path(filepath).name
+        self.worker = ImportWorker(
+            self.kb_name,
+            Path(filepath),
+            self.chunk_spin.value(),
+            self.full_check.isChecked(),
+            self.worker_spin.value()
+        )
+        self.worker.signals.progress.connect(self.on_import_progress)
+        self.worker.signals.finished.connect(self.on_import_finished)
+        self.worker.signals.error.connect(self.on_import_error)
 
-        if self.full_check.isChecked():
-            segments: list[Segment] = [
-                Segment(text=text, metadata={"source": source, "chunk_index": "0"})
-            ]
-        else:
-            segmenter = MarkdownSegmenter(chunk_size=self.chunk_spin.value())
-            segments = segmenter.parse(text, {"source": source})
+        self.thread_pool.start(self.worker)
+
+    def stop_import(self) -> None:
+        """关闭对话框时停止正在进行的导入"""
+        if self.worker:
+            self.worker.stop()
+            self.worker = None
 
-        vector = get_knowledge_vector(self.kb_name)
-        vector.add_segments(segments)
+    def on_import_progress(self, count: int) -> None:
+        """导入进度更新"""
+        self.status.setText(f"已导入 {count} 个片段...")
 
+    def on_import_finished(self, count: int) -> None:
+        """导入完成"""
+        self.worker = None
         self.status.setText("就绪")
         QtWidgets.QMessageBox.information(
-            self, "成功", f"导入 {len(segments)} 个片段", QtWidgets.QMessageBox.StandardButton.Ok
+            self, "成功", f"导入 {count} 个片段", QtWidgets.QMessageBox.StandardButton.Ok
         )
 
         self.import_button.setEnabled(True)
 
+    def on_import_error(self, error_msg: str) -> None:
+        """导入出错"""
+        self.worker = None
+        self.status.setText("导入失败")
+
+        dialog: ErrorDialog = ErrorDialog("导入失败：", error_msg, self)
+        dialog.exec()
+
+        self.import_button.setEnabled(True)
+
 
 class KnowledgeViewDialog(QtWidgets.QDialog):
     """查看知识库片段"""
 
     PAGE_SIZE: int = 50  # 每页显示的条目数
 
-    def __init__(self, kb_name: str, parent: QtWidgets.QWidget | None = None) -> None:
+    def __init__(
+        self,
+        kb_name: str,
+        vector: "DuckdbVector",
+        parent: QtWidgets.QWidget | None = None
+    ) -> None:
         """构造函数"""
         super().__init__(parent)
 
         self.kb_name: str = kb_name
+        self.vector: DuckdbVector = vector
         self.current_page: int = 0
-        self.total_count: int = 0
+
+        # 片段总数在对话框打开期间不会变化，只查询一次
+        self.total_count: int = vector.count
+
+        # 搜索索引：来源节点及其片段节点和小写文本，每页加载时构建一次
+        self.search_index: list[
+            tuple[QtWidgets.QTreeWidgetItem, list[tuple[QtWidgets.QTreeWidgetItem, str]]]
+        ] = []
 
         self.init_ui()
         self.load_data()
@@ -1844,19 +1994,15 @@ class KnowledgeViewDialog(QtWidgets.QDialog):
 
     def load_data(self) -> None:
         """加载当前页数据"""
-        from .knowledge import get_knowledge_vector
-
-        vector = get_knowledge_vector(self.kb_name)
-        self.total_count = vector.count
-
         # 计算分页参数
         offset: int = self.current_page * self.PAGE_SIZE
-        segments = vector.list_segments(limit=self.PAGE_SIZE, offset=offset)
+        segments = self.vector.list_segments(limit=self.PAGE_SIZE, offset=offset)
 
         # 清空并重建
         self.tree_widget.clear()
         self.meta_label.clear()
         self.text_edit.clear()
+        self.search_index = []
 
         # 按来源分组
         grouped: dict[str, list] = {}
@@ -1873,6 +2019,9 @@ class KnowledgeViewDialog(QtWidgets.QDialog):
             parent.setExpanded(True)
             self.tree_widget.addTopLevelItem(parent)
 
+            children: list[tuple[QtWidgets.QTreeWidgetItem, str]] = []
+            self.search_index.append((parent, children))
+
             for seg in segs:
                 preview: str = seg.text[:60].replace("\n", " ").strip()
                 child: QtWidgets.QTreeWidgetItem = QtWidgets.QTreeWidgetItem(
@@ -1880,6 +2029,7 @@ class KnowledgeViewDialog(QtWidgets.QDialog):
                 )
                 child.setData(0, QtCore.Qt.ItemDataRole.UserRole, seg)
                 parent.addChild(child)
+                children.append((child, seg.text.lower()))
 
         # 更新分页状态
         self._update_page_state()
@@ -1899,17 +2049,10 @@ class KnowledgeViewDialog(QtWidgets.QDialog):
     def on_search(self, text: str) -> None:
         """搜索过滤片段"""
         text = text.lower()
-        for i in range(self.tree_widget.topLevelItemCount()):
-            parent: QtWidgets.QTreeWidgetItem | None = self.tree_widget.topLevelItem(i)
-            if parent is None:
-                continue
+        for parent, children in self.search_index:
             parent_visible: bool = False
-            for j in range(parent.childCount()):
-                child: QtWidgets.QTreeWidgetItem | None = parent.child(j)
-                if child is None:
-                    continue
-                seg = child.data(0, QtCore.Qt.ItemDataRole.UserRole)
-                visible: bool = text in seg.text.lower() if seg else False
+            for child, child_text in children:
+                visible: bool = text in child_text
                 child.setHidden(not visible)
                 if visible:
                     parent_visible = True
@@ -1946,25 +2089,33 @@ class KnowledgeViewDialog(QtWidgets.QDialog):
         )
         self.meta_label.setText(meta_html)
         # 显示内容
-        self.text_edit.setText(seg.text)
+        self.text_edit.setPlainText(seg.text)
 
 
 class KnowledgeDialog(QtWidgets.QDialog):
     """知识库管理对话框"""
 
+    MAX_VECTORS: int = 8  # 缓存的向量存储数量上限
+
     def __init__(self, parent: QtWidgets.QWidget | None = None) -> None:
         """构造函数"""
         super().__init__(parent)
         self.setWindowTitle("知识库管理")
         self.setMinimumSize(700, 500)
+
+        # 已打开的向量存储（按最近使用排序）
+        self.vectors: OrderedDict[str, DuckdbVector] = OrderedDict()
+
         self.init_ui()
         self.refresh()
 
+        self.finished.connect(self.close_vectors)
+
     def init_ui(self) -> None:
         """初始化UI"""
         self.table: QtWidgets.QTableWidget = QtWidgets.QTableWidget()
-        self.table.setColumnCount(2)
-        self.table.setHorizontalHeaderLabels(["名称", "描述"])
+        self.table.setColumnCount(3)
+        self.table.setHorizontalHeaderLabels(["名称", "描述", "大小"])
         self.table.horizontalHeader().setSectionResizeMode(1, QtWidgets.QHeaderView.ResizeMode.Stretch)
         self.table.verticalHeader().setVisible(False)
         self.table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
@@ -2000,15 +2151,46 @@ class KnowledgeDialog(QtWidgets.QDialog):
 
     def refresh(self) -> None:
         """刷新列表"""
-        from .knowledge import list_knowledge_bases
-        kbs: list[dict[str, str]] = list_knowledge_bases()
-        self.table.setRowCount(0)
-
-        for kb in kbs:
-            row: int = self.table.rowCount()
-            self.table.insertRow(row)
-            self.table.setItem(row, 0, QtWidgets.QTableWidgetItem(kb["name"]))
-            self.table.setItem(row, 1, QtWidgets.QTableWidgetItem(kb["description"]))
+        from .knowledge import list_knowledge_bases, get_knowledge_sizes
+        kbs: list[dict[str, str]] = sorted(list_knowledge_bases(), key=lambda kb: kb["name"])
+        sizes: dict[str, int] = get_knowledge_sizes()
+
+        # 批量更新表格，避免逐行插入触发重复布局
+        self.table.setUpdatesEnabled(False)
+        self.table.setRowCount(len(kbs))
+
+        for row, kb in enumerate(kbs):
+            self._set_row(row, kb["name"], kb["description"], sizes.get(kb["name"], 0))
+
+        self.table.setUpdatesEnabled(True)
+
+    def _set_row(self, row: int, name: str, description: str, size: int = 0) -> None:
+        """设置单行内容"""
+        self.table.setItem(row, 0, QtWidgets.QTableWidgetItem(name))
+        self.table.setItem(row, 1, QtWidgets.QTableWidgetItem(description))
+        self.table.setItem(row, 2, QtWidgets.QTableWidgetItem(format_size(size)))
+
+    def _add_row(self, name: str, description: str) -> None:
+        """按名称顺序插入一行"""
+        row: int = 0
+        while row < self.table.rowCount():
+            item: QtWidgets.QTableWidgetItem | None = self.table.item(row, 0)
+            if item and item.text() > name:
+                break
+            row += 1
+
+        self.table.insertRow(row)
+        self._set_row(row, name, description)
+
+    def _remove_row(self, name: str) -> None:
+        """移除指定名称的行"""
+        items: list[QtWidgets.QTableWidgetItem] = self.table.findItems(
+            name, QtCore.Qt.MatchFlag.MatchExactly
+        )
+        for item in items:
+            if item.column() == 0:
+                self.table.removeRow(item.row())
+                return
 
     def _on_selection_changed(self) -> None:
         """选择变化时更新按钮状态"""
@@ -2034,7 +2216,7 @@ class KnowledgeDialog(QtWidgets.QDialog):
             try:
                 from .knowledge import create_knowledge_base
                 create_knowledge_base(**data)
-                self.refresh()
+                self._add_row(data["name"], data["description"])
             except Exception as e:
                 QtWidgets.QMessageBox.warning(self, "错误", str(e))
 
@@ -2047,15 +2229,54 @@ class KnowledgeDialog(QtWidgets.QDialog):
         dialog: KnowledgeImportDialog = KnowledgeImportDialog(name, self)
         dialog.exec()
 
+        # 导入后数据库大小发生变化
+        self.refresh()
+
     def view_knowledge(self) -> None:
         """查看知识库"""
         name: str | None = self._selected_name()
         if not name:
             QtWidgets.QMessageBox.warning(self, "提示", "请先选择知识库")
             return
-        dialog: KnowledgeViewDialog = KnowledgeViewDialog(name, self)
+        try:
+            vector: DuckdbVector = self.get_vector(name)
+        except Exception as e:
+            QtWidgets.QMessageBox.warning(self, "错误", str(e))
+            return
+
+        dialog: KnowledgeViewDialog = KnowledgeViewDialog(name, vector, self)
         dialog.exec()
 
+    def get_vector(self, name: str) -> "DuckdbVector":
+        """获取知识库向量存储，重复查看时复用已打开的连接"""
+        from .knowledge import get_knowledge_vector
+
+        vector: DuckdbVector | None = self.vectors.get(name)
+        if vector is None:
+            vector = get_knowledge_vector(name)
+            self.vectors[name] = vector
+
+        self.vectors.move_to_end(name)
+
+        # 超出上限时关闭最久未使用的连接
+        while len(self.vectors) > self.MAX_VECTORS:
+            _, oldest = self.vectors.popitem(last=False)
+            oldest.close()
+
+        return vector
+
+    def close_vector(self, name: str) -> None:
+        """关闭指定知识库的向量存储"""
+        vector: DuckdbVector | None = self.vectors.pop(name, None)
+        if vector:
+            vector.close()
+
+    def close_vectors(self) -> None:
+        """关闭所有已打开的向量存储"""
+        for vector in self.vectors.values():
+            vector.close()
+        self.vectors.clear()
+
     def delete_knowledge(self) -> None:
         """删除知识库"""
         name: str | None = self._selected_name()
@@ -2067,5 +2288,6 @@ class KnowledgeDialog(QtWidgets.QDialog):
         )
         if reply == QtWidgets.QMessageBox.StandardButton.Yes:
             from .knowledge import delete_knowledge_base
+            self.close_vector(name)
             delete_knowledge_base(name)
-            self.refresh()
+            self._remove_row(name)
@@ -1,23 +1,46 @@
 import re
+from functools import partial
+from threading import Lock
 from typing import cast
 
 from ..engine import AgentEngine
 from ..interaction import AskPayload, set_ask_handler
 from ..utility import WORKING_DIR, write_text_file
-from ..agent import Profile, TaskAgent
+from ..agent import Profile, TaskAgent, set_session_writer
 from .. import __version__
 from .widget import (
     AgentWidget,
+    build_markdown_text,
     ToolDialog,
     ModelDialog,
     ProfileDialog,
     GatewayDialog,
     KnowledgeDialog,
 )
-from .setting import get_setting
+from .worker import SessionWriteWorker
+from .setting import get_setting, load_favorite_models
 from .qt import QtWidgets, QtGui, QtCore
 
 
+# 会话列表样式表
+SESSION_LIST_STYLESHEET: str = """
+    QListWidget::item {
+        padding-top: 10px;
+        padding-bottom: 10px;
+        padding-left: 10px;
+        border-radius: 12px;
+    }
+    QListWidget::item:hover {
+        background-color: rgba(42, 92, 142, 0.3);
+        color: white;
+    }
+    QListWidget::item:selected {
+        background-color: #4a90e2;
+        color: white;
+    }
+"""
+
+
 class AskInvoker(QtCore.QObject):
     """在 GUI 主线程中执行 ask_user 弹窗。"""
 
@@ -58,6 +81,117 @@ class AskInvoker(QtCore.QObject):
         self.answer = text.strip() if ok else ""
 
 
+class SessionSaver(QtCore.QObject):
+    """
+    合并短时间内的多次会话保存请求，延迟写入文件。
+
+    会话在主线程中序列化后放入待写入表，由单个后台Worker批量写入。
+    """
+
+    # 保存间隔（毫秒）
+    SAVE_INTERVAL: int = 500
+
+    # 保存请求（可能来自工作线程），排队到主线程处理
+    requested: QtCore.Signal = QtCore.Signal(object)
+
+    def __init__(self, parent: QtCore.QObject) -> None:
+        """构造函数。"""
+        super().__init__(parent)
+
+        self.pending: dict[str, TaskAgent] = {}
+
+        # 各会话最近一次写入内容的哈希，内容未变化时跳过写入
+        self.hashes: dict[str, int] = {}
+
+        # 待写入的会话文本，以及后台Worker是否在运行
+        self.lock: Lock = Lock()
+        self.texts: dict[str, str] = {}
+        self.writing: bool = False
+
+        self.thread_pool: QtCore.QThreadPool = QtCore.QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(1)
+
+        self.timer: QtCore.QTimer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(self.SAVE_INTERVAL)
+        self.timer.timeout.connect(self.flush)
+
+        self.requested.connect(self._on_requested)
+
+    def save(self, agent: TaskAgent) -> None:
+        """请求保存会话，可在任意线程调用。"""
+        self.requested.emit(agent)
+
+    def _on_requested(self, agent: TaskAgent) -> None:
+        """记录待保存的会话，并重新开始计时。"""
+        # 会话已被删除
+        if not agent.save:
+            return
+
+        self.pending[agent.id] = agent
+        self.timer.start()
+
+    def discard(self, session_id: str) -> None:
+        """丢弃会话的待保存请求，并等待进行中的写入完成（会话被删除时调用）。"""
+        self.pending.pop(session_id, None)
+        self.hashes.pop(session_id, None)
+
+        with self.lock:
+            self.texts.pop(session_id, None)
+
+        self.thread_pool.waitForDone()
+
+    def flush(self) -> None:
+        """将所有待保存的会话序列化，交给后台Worker写入。"""
+        self.timer.stop()
+
+        if not self.pending:
+            return
+
+        pending: list[TaskAgent] = list(self.pending.values())
+        self.pending.clear()
+
+        texts: dict[str, str] = {}
+        for agent in pending:
+            text: str = agent.dump_session()
+
+            text_hash: int = hash(text)
+            if self.hashes.get(agent.id) == text_hash:
+                continue
+
+            self.hashes[agent.id] = text_hash
+            texts[agent.id] = text
+
+        if not texts:
+            return
+
+        with self.lock:
+            self.texts.update(texts)
+
+            # 后台Worker仍在运行时，新内容会被其继续写入
+            if self.writing:
+                return
+            self.writing = True
+
+        self.thread_pool.start(SessionWriteWorker(self._take_texts))
+
+    def _take_texts(self) -> dict[str, str]:
+        """取出全部待写入的会话文本（在后台线程中调用）。"""
+        with self.lock:
+            texts: dict[str, str] = self.texts
+            self.texts = {}
+
+            if not texts:
+                self.writing = False
+
+            return texts
+
+    def close(self) -> None:
+        """写入所有待保存的会话，并等待写入完成。"""
+        self.flush()
+        self.thread_pool.waitForDone()
+
+
 class MainWindow(QtWidgets.QMainWindow):
     """主窗口"""
 
@@ -67,19 +201,25 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self.engine: AgentEngine = engine
 
+        # 所有会话的智能体，会话窗口在首次切换时才创建
+        self.agents: dict[str, TaskAgent] = {}
         self.agent_widgets: dict[str, AgentWidget] = {}
 
+        # 会话列表中的列表项，切换会话时直接选中，无需重建列表
+        self.session_items: dict[str, QtWidgets.QListWidgetItem] = {}
+
         self.current_id: str = ""
 
-        self.models: list[str] = self.engine.list_models()
+        self.favorite_models: list[str] = []
 
         self.first_show: bool = True
         self.ask_invoker: AskInvoker = AskInvoker(self)
+        self.session_saver: SessionSaver = SessionSaver(self)
 
         self.init_ui()
-        self.load_data()
 
         self.init_ask_handler()
+        self.init_session_writer()
 
     def init_ui(self) -> None:
         """初始化UI"""
@@ -97,6 +237,10 @@ class MainWindow(QtWidgets.QMainWindow):
         """注册 GUI 环境下的 ask_user 处理函数。"""
         set_ask_handler(self._ask)
 
+    def init_session_writer(self) -> None:
+        """注册 GUI 环境下的会话保存函数，合并频繁的保存操作。"""
+        set_session_writer(self.session_saver.save)
+
     def _ask(self, payload: AskPayload) -> str:
         """在主线程中同步向用户提问。"""
         self.ask_invoker.payload = payload
@@ -130,23 +274,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.session_list: QtWidgets.QListWidget = QtWidgets.QListWidget()
 
         # 设置自定义样式表
-        stylesheet: str = """
-            QListWidget::item {
-                padding-top: 10px;
-                padding-bottom: 10px;
-                padding-left: 10px;
-                border-radius: 12px;
-            }
-            QListWidget::item:hover {
-                background-color: rgba(42, 92, 142, 0.3);
-                color: white;
-            }
-            QListWidget::item:selected {
-                background-color: #4a90e2;
-                color: white;
-            }
-        """
-        self.session_list.setStyleSheet(stylesheet)
+        self.session_list.setStyleSheet(SESSION_LIST_STYLESHEET)
 
         self.session_list.currentItemChanged.connect(self.on_current_item_changed)
         self.session_list.setContextMenuPolicy(QtCore.Qt.ContextMenuPolicy.CustomContextMenu)
@@ -289,11 +417,21 @@ class MainWindow(QtWidgets.QMainWindow):
         dialog.setWindowState(QtCore.Qt.WindowState.WindowMaximized)
         dialog.exec()
 
+        self.update_favorite_models()
+
         for agent_widget in self.agent_widgets.values():
-            agent_widget.load_favorite_models()
+            agent_widget.load_favorite_models(self.favorite_models)
+
+    def update_favorite_models(self) -> None:
+        """读取常用模型，仅保留当前网关支持的模型，供所有会话窗口共用"""
+        available_models: set[str] = set(self.engine.list_models())
+        self.favorite_models = [m for m in load_favorite_models() if m in available_models]
 
     def load_data(self) -> None:
-        """加载智能体配置和所有会话"""
+        """加载模型列表、智能体配置和所有会话"""
+        # 查询模型列表可能需要网络请求
+        self.update_favorite_models()
+
         self.update_profile_combo()
 
         self.load_agent_widgets()
@@ -306,7 +444,7 @@ class MainWindow(QtWidgets.QMainWindow):
         for agent in agents:
             self.add_agent_widget(agent)
 
-        if not self.agent_widgets:
+        if not self.agents:
             self.new_agent_widget()
         else:
             self.current_id = agents[0].id
@@ -321,20 +459,21 @@ class MainWindow(QtWidgets.QMainWindow):
 
         # 清空列表
         self.session_list.clear()
+        self.session_items.clear()
 
         # 排序会话（新会话在前）
-        sorted_widgets = sorted(
-            self.agent_widgets.values(),
-            key=lambda w: w.agent.id,
+        sorted_agents: list[TaskAgent] = sorted(
+            self.agents.values(),
+            key=lambda a: a.id,
             reverse=True
         )
 
         # 添加会话到列表
-        for widget in sorted_widgets:
-            agent: TaskAgent = widget.agent
+        for agent in sorted_agents:
             item: QtWidgets.QListWidgetItem = QtWidgets.QListWidgetItem(agent.name)
             item.setData(QtCore.Qt.ItemDataRole.UserRole, agent.id)
             self.session_list.addItem(item)
+            self.session_items[agent.id] = item
 
             if agent.id == self.current_id:
                 self.session_list.setCurrentItem(item)
@@ -342,6 +481,35 @@ class MainWindow(QtWidgets.QMainWindow):
         # 恢复信号
         self.session_list.blockSignals(False)
 
+    def insert_agent_item(self, agent: TaskAgent) -> None:
+        """在列表顶部插入会话项（新会话编号最大，排在最前）"""
+        item: QtWidgets.QListWidgetItem = QtWidgets.QListWidgetItem(agent.name)
+        item.setData(QtCore.Qt.ItemDataRole.UserRole, agent.id)
+
+        self.session_list.blockSignals(True)
+        self.session_list.insertItem(0, item)
+        self.session_list.blockSignals(False)
+
+        self.session_items[agent.id] = item
+
+    def update_agent_item(self, session_id: str) -> None:
+        """更新会话项显示的名称"""
+        agent: TaskAgent | None = self.agents.get(session_id)
+        item: QtWidgets.QListWidgetItem | None = self.session_items.get(session_id)
+
+        if agent and item:
+            item.setText(agent.name)
+
+    def remove_agent_item(self, session_id: str) -> None:
+        """移除会话项"""
+        item: QtWidgets.QListWidgetItem | None = self.session_items.pop(session_id, None)
+        if not item:
+            return
+
+        self.session_list.blockSignals(True)
+        self.session_list.takeItem(self.session_list.row(item))
+        self.session_list.blockSignals(False)
+
     def new_agent_widget(self) -> None:
         """创建新会话"""
         # 获取当前选中的智能体配置名称
@@ -360,35 +528,50 @@ class MainWindow(QtWidgets.QMainWindow):
         agent: TaskAgent = self.engine.create_agent(profile, save=True)
         self.add_agent_widget(agent)
 
-        # 更新列表并切换到新窗口
-        self.update_agent_list()
+        # 插入列表项并切换到新窗口
+        self.insert_agent_item(agent)
         self.switch_agent_widget(agent.id)
 
     def add_agent_widget(self, agent: TaskAgent) -> None:
-        """添加会话窗口"""
-        widget: AgentWidget = AgentWidget(
-            engine=self.engine,
-            agent=agent,
-            update_list=self.update_agent_list
-        )
-        self.stacked_widget.addWidget(widget)
-        self.agent_widgets[agent.id] = widget
+        """添加会话（窗口延迟到首次切换时创建）"""
+        self.agents[agent.id] = agent
+
+    def get_agent_widget(self, session_id: str) -> AgentWidget:
+        """获取会话窗口，不存在则创建"""
+        widget: AgentWidget | None = self.agent_widgets.get(session_id)
+
+        if not widget:
+            widget = AgentWidget(
+                engine=self.engine,
+                agent=self.agents[session_id],
+                update_list=partial(self.update_agent_item, session_id),
+                favorite_models=self.favorite_models
+            )
+            self.stacked_widget.addWidget(widget)
+            self.agent_widgets[session_id] = widget
+
+        return widget
 
     def switch_agent_widget(self, session_id: str) -> None:
         """根据ID切换会话"""
         self.current_id = session_id
 
-        widget: AgentWidget = self.agent_widgets[session_id]
+        widget: AgentWidget = self.get_agent_widget(session_id)
         self.stacked_widget.setCurrentWidget(widget)
-        self.update_agent_list()
+
+        # 只更新列表选中项
+        item: QtWidgets.QListWidgetItem | None = self.session_items.get(session_id)
+        if item and self.session_list.currentItem() is not item:
+            self.session_list.blockSignals(True)
+            self.session_list.setCurrentItem(item)
+            self.session_list.blockSignals(False)
 
     def rename_agent_widget(self, session_id: str) -> None:
         """重命名会话"""
-        widget: AgentWidget | None = self.agent_widgets.get(session_id)
-        if not widget:
+        agent: TaskAgent | None = self.agents.get(session_id)
+        if not agent:
             return
 
-        agent: TaskAgent = widget.agent
         text, ok = QtWidgets.QInputDialog.getText(
             self,
             "重命名会话",
@@ -397,8 +580,8 @@ class MainWindow(QtWidgets.QMainWindow):
         )
 
         if ok and text:
-            widget.agent.rename(text)
-            self.update_agent_list()
+            agent.rename(text)
+            self.update_agent_item(session_id)
 
     def delete_agent_widget(self, session_id: str) -> None:
         """删除会话"""
@@ -411,34 +594,42 @@ class MainWindow(QtWidgets.QMainWindow):
         )
 
         if reply == QtWidgets.QMessageBox.StandardButton.Yes:
-            # 移除对应的控件
-            widget: AgentWidget | None = self.agent_widgets.pop(session_id, None)
-            if widget:
+            # 移除对应的会话
+            self.session_saver.discard(session_id)
+
+            agent: TaskAgent | None = self.agents.pop(session_id, None)
+            if agent:
+                # 停止保存，避免排队中的保存请求重新写入文件
+                agent.save = False
+
                 # 从文件系统删除
                 self.engine.delete_agent(session_id)
 
+            # 移除已创建的控件
+            widget: AgentWidget | None = self.agent_widgets.pop(session_id, None)
+            if widget:
                 self.stacked_widget.removeWidget(widget)
                 widget.deleteLater()
 
+            self.remove_agent_item(session_id)
+
             # 如果删除的是当前会话，则切换到另一个会话
             if self.current_id == session_id:
-                if self.agent_widgets:
-                    self.current_id = next(iter(self.agent_widgets.keys()))
+                if self.agents:
+                    self.current_id = next(iter(self.agents.keys()))
                     self.switch_agent_widget(self.current_id)
                 else:
                     self.new_agent_widget()
 
-            self.update_agent_list()
-
     def export_session_markdown(self, session_id: str) -> None:
         """将会话正文导出为 Markdown 文件"""
-        widget: AgentWidget | None = self.agent_widgets.get(session_id)
-        if not widget:
+        agent: TaskAgent | None = self.agents.get(session_id)
+        if not agent:
             return
 
-        text: str = widget.build_markdown_text()
+        text: str = build_markdown_text(agent)
 
-        safe_name: str = re.sub(r'[<>:"/\\|?*]', "_", widget.agent.name).strip()
+        safe_name: str = re.sub(r'[<>:"/\\|?*]', "_", agent.name).strip()
         default_name: str = f"{safe_name}.md" if safe_name else f"{session_id}.md"
 
         path, _ = QtWidgets.QFileDialog.getSaveFileName(
@@ -498,6 +689,7 @@ class MainWindow(QtWidgets.QMainWindow):
             self.first_show = False
 
             # 延迟调用，让主界面先完成渲染
+            QtCore.QTimer.singleShot(0, self.load_data)
             QtCore.QTimer.singleShot(100, self.check_gateway_setting)
 
     def check_gateway_setting(self) -> None:
@@ -531,6 +723,10 @@ class MainWindow(QtWidgets.QMainWindow):
         """退出应用程序"""
         set_ask_handler(None)
 
+        # 写入尚未保存的会话
+        set_session_writer(None)
+        self.session_saver.close()
+
         self.tray_icon.hide()
         QtWidgets.QApplication.quit()
 
@@ -1,8 +1,22 @@
+import time
 import traceback
+from collections import deque
+from collections.abc import Callable, Generator, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from queue import Queue
+from threading import Thread
 from typing import Any
 
-from ..agent import TaskAgent
+import numpy as np
+from numpy.typing import NDArray
+
+from ..agent import TaskAgent, write_session_file
 from ..constant import Role, DeltaEvent
+from ..embedder import BaseEmbedder
+from ..object import Message, Segment
+from ..utility import read_text_file
 from .qt import QtCore
 
 
@@ -38,19 +52,48 @@ class StreamSignals(QtCore.QObject):
     warning: QtCore.Signal = QtCore.Signal(str)
 
 
+# 流式请求线程池的最大线程数
+STREAM_THREAD_COUNT: int = 64
+
+_stream_pool: QtCore.QThreadPool | None = None
+
+
+def get_stream_pool() -> QtCore.QThreadPool:
+    """
+    获取流式请求专用线程池
+
+    流式请求的线程大部分时间阻塞在网络读取上，全局线程池默认按 CPU 核数限制线程数，
+    多个会话同时请求时会排队等待，因此使用按 I/O 并发量配置的独立线程池。
+    """
+    global _stream_pool
+
+    if _stream_pool is None:
+        _stream_pool = QtCore.QThreadPool()
+        _stream_pool.setMaxThreadCount(STREAM_THREAD_COUNT)
+
+    return _stream_pool
+
+
 class StreamWorker(QtCore.QRunnable):
     """
     在线程池中处理流式网关请求的Worker
     """
-    def __init__(self, agent: TaskAgent, prompt: str) -> None:
-        """构造函数"""
+    flush_interval: float = 0.033      # 数据块合并发送的间隔（秒）
+
+    def __init__(self, agent: TaskAgent, prompt: str, signals: StreamSignals) -> None:
+        """构造函数（信号对象由发起请求的窗口持有，多次请求共用）"""
         super().__init__()
 
         self.agent: TaskAgent = agent
         self.prompt: str = prompt
-        self.signals: StreamSignals = StreamSignals()
+        self.signals: StreamSignals = signals
         self.stopped: bool = False
 
+        # 尚未发送的数据块，合并后再跨线程发送信号
+        self.pending_thinking: list[str] = []
+        self.pending_content: list[str] = []
+        self.last_flush: float = 0.0
+
     def stop(self) -> None:
         """停止流式请求"""
         self.stopped = True
@@ -64,6 +107,18 @@ class StreamWorker(QtCore.QRunnable):
             # 信号对象已被删除（窗口已关闭），忽略
             pass
 
+    def _flush(self) -> None:
+        """发送已合并的 thinking 和 content 数据块"""
+        if self.pending_thinking:
+            self._safe_emit(self.signals.thinking, "".join(self.pending_thinking))
+            self.pending_thinking.clear()
+
+        if self.pending_content:
+            self._safe_emit(self.signals.content, "".join(self.pending_content))
+            self.pending_content.clear()
+
+        self.last_flush = time.monotonic()
+
     def run(self) -> None:
         """处理数据流"""
         # 累积 Token 使用量
@@ -79,10 +134,15 @@ class StreamWorker(QtCore.QRunnable):
                     break
                 # 收到 thinking 数据块
                 if delta.thinking:
-                    self._safe_emit(self.signals.thinking, delta.thinking)
+                    self.pending_thinking.append(delta.thinking)
                 # 收到 content 数据块
                 if delta.content:
-                    self._safe_emit(self.signals.content, delta.content)
+                    self.pending_content.append(delta.content)
+
+                # 距上次发送超过间隔，或有结构化事件（需保持与正文的先后顺序）时发送
+                if delta.event or time.monotonic() - self.last_flush >= self.flush_interval:
+                    self._flush()
+
                 # 累积 Token 使用量
                 if delta.usage:
                     total_input += delta.usage.input_tokens
@@ -110,9 +170,15 @@ class StreamWorker(QtCore.QRunnable):
             # 中止流式生成，保存已生成的部分内容
             self.agent.abort_stream()
 
+            # 先发送已收到的数据块，再发送错误
+            self._flush()
+
             error_msg: str = traceback.format_exc()
             self._safe_emit(self.signals.error, error_msg)
         finally:
+            # 发送剩余的数据块
+            self._flush()
+
             # 发送最终的 Token 使用量
             self._safe_emit(self.signals.usage, total_input, total_output)
             self._safe_emit(self.signals.finished)
@@ -133,12 +199,283 @@ class StreamWorker(QtCore.QRunnable):
         if self.agent.name != "默认会话":
             return False
 
+        messages: list[Message] = self.agent.messages
+
         # 检查是否完成了首次对话（系统消息 + 用户消息 + 助手消息 = 3条）
-        if len(self.agent.messages) < 3:
+        if len(messages) < 3:
             return False
 
-        # 确保最后一条是助手消息
-        if self.agent.messages[-1].role != Role.ASSISTANT:
+        # 确保最后一条是助手消息（角色经 pydantic 校验后总是枚举成员）
+        if messages[-1].role is not Role.ASSISTANT:
             return False
 
         return True
+
+
+class SessionWriteWorker(QtCore.QRunnable):
+    """
+    在后台线程中写入会话文件的Worker
+
+    循环取出待写入的会话文本直到为空，写入期间新增的保存请求由同一个Worker处理，
+    同一会话的多次保存只写入最新内容。
+    """
+    def __init__(self, take_texts: Callable[[], dict[str, str]]) -> None:
+        """构造函数"""
+        super().__init__()
+
+        self.take_texts: Callable[[], dict[str, str]] = take_texts
+
+    def run(self) -> None:
+        """写入文件"""
+        while True:
+            texts: dict[str, str] = self.take_texts()
+            if not texts:
+                break
+
+            for session_id, text in texts.items():
+                try:
+                    write_session_file(session_id, text)
+                except Exception:
+                    traceback.print_exc()
+
+
+class ImportSignals(QtCore.QObject):
+    """
+    定义ImportWorker可以发出的信号
+    """
+    # 导入进度（已写入的片段数量）
+    progress: QtCore.Signal = QtCore.Signal(int)
+
+    # 导入完成（写入的片段总数）
+    finished: QtCore.Signal = QtCore.Signal(int)
+
+    # 导入错误
+    error: QtCore.Signal = QtCore.Signal(str)
+
+
+class ImportWorker(QtCore.QRunnable):
+    """
+    在线程池中处理知识库文档导入的Worker
+
+    导入过程拆分为三个阶段的流水线：切片 -> 向量化 -> 写入数据库，
+    各阶段之间通过有界队列衔接，使向量化的网络请求与数据库写入相互重叠。
+    """
+
+    # 每批向量化的片段数量
+    batch_size: int = 100
+
+    # 阶段之间的队列容量
+    queue_size: int = 4
+
+    # 流式读取文件时每次读取的字符数
+    read_size: int = 1 << 20
+
+    # 进度信号的最小发送间隔（秒）
+    progress_interval: float = 0.033
+
+    def __init__(
+        self,
+        kb_name: str,
+        filepath: Path,
+        chunk_size: int,
+        full: bool = False,
+        max_workers: int = 4
+    ) -> None:
+        """构造函数"""
+        super().__init__()
+
+        self.kb_name: str = kb_name
+        self.filepath: Path = filepath
+        self.chunk_size: int = chunk_size
+        self.full: bool = full
+        self.max_workers: int = max_workers
+
+        self.signals: ImportSignals = ImportSignals()
+        self.stopped: bool = False
+
+        # 各线程中捕获的异常信息
+        self.errors: list[str] = []
+
+    def stop(self) -> None:
+        """停止导入"""
+        self.stopped = True
+
+    def _safe_emit(self, signal: QtCore.SignalInstance, *args: Any) -> None:
+        """安全地发出信号，忽略对象已删除的情况"""
+        try:
+            signal.emit(*args)
+        except RuntimeError:
+            # 信号对象已被删除（窗口已关闭），忽略
+            pass
+
+    def run(self) -> None:
+        """处理导入流水线"""
+        from .knowledge import get_knowledge_vector
+
+        try:
+            vector = get_knowledge_vector(self.kb_name)
+        except Exception:
+            self._safe_emit(self.signals.error, traceback.format_exc())
+            return
+
+        # 整个导入在同一个事务中完成，失败或中止时整体回滚
+        # 在启动上游线程前开启，失败时无需排空队列
+        try:
+            vector.begin()
+        except Exception:
+            vector.close()
+            self._safe_emit(self.signals.error, traceback.format_exc())
+            return
+
+        segment_queue: Queue[list[Segment] | None] = Queue(maxsize=self.queue_size)
+        embed_queue: Queue[tuple[list[Segment], NDArray[np.float32]] | None] = Queue(
+            maxsize=self.queue_size
+        )
+
+        # 启动切片和向量化线程
+        segment_thread: Thread = Thread(
+            target=self._produce_segments,
+            args=(segment_queue,),
+            daemon=True
+        )
+        embed_thread: Thread = Thread(
+            target=self._embed_segments,
+            args=(vector.embedder, segment_queue, embed_queue),
+            daemon=True
+        )
+        segment_thread.start()
+        embed_thread.start()
+
+        # 当前线程负责写入数据库，直到收到结束标记
+        count: int = 0
+        last_emit: float = 0.0
+
+        while True:
+            item: tuple[list[Segment], NDArray[np.float32]] | None = embed_queue.get()
+            if item is None:
+                break
+
+            # 已停止或出错，仅排空队列，让上游线程尽快退出
+            if self.stopped or self.errors:
+                continue
+
+            segments, embeddings = item
+            try:
+                vector.add_embeddings(segments, embeddings)
+            except Exception:
+                self.errors.append(traceback.format_exc())
+                continue
+
+            count += len(segments)
+
+            # 限制进度信号频率，避免大量跨线程信号挤占界面事件循环
+            now: float = time.monotonic()
+            if now - last_emit >= self.progress_interval:
+                last_emit = now
+                self._safe_emit(self.signals.progress, count)
+
+        segment_thread.join()
+        embed_thread.join()
+
+        try:
+            if self.errors or self.stopped:
+                vector.rollback()
+            else:
+                vector.commit()
+        except Exception:
+            self.errors.append(traceback.format_exc())
+        finally:
+            # 关闭数据库连接，避免每次导入都遗留一个打开的连接
+            vector.close()
+
+        if self.errors:
+            self._safe_emit(self.signals.error, self.errors[0])
+        elif not self.stopped:
+            # 完成信号携带最终数量，保证界面显示准确
+            self._safe_emit(self.signals.finished, count)
+
+    def _produce_segments(self, segment_queue: Queue[list[Segment] | None]) -> None:
+        """切片阶段：读取文件并按批次放入队列"""
+        try:
+            batch: list[Segment] = []
+
+            for segment in self._generate_segments():
+                if self.stopped or self.errors:
+                    break
+
+                batch.append(segment)
+                if len(batch) >= self.batch_size:
+                    segment_queue.put(batch)
+                    batch = []
+
+            if batch and not self.stopped:
+                segment_queue.put(batch)
+        except Exception:
+            self.errors.append(traceback.format_exc())
+        finally:
+            segment_queue.put(None)
+
+    def _generate_segments(self) -> Generator[Segment, None, None]:
+        """读取文件并生成文档片段"""
+        from ..segmenters.markdown_segmenter import MarkdownSegmenter
+
+        source: str = self.filepath.name
+
+        if self.full:
+            text: str = read_text_file(self.filepath)
+            yield Segment(text=text, metadata={"source": source, "chunk_index": "0"})
+            return
+
+        # 分块读取文件，边读边切片，内存占用与文件大小无关
+        segmenter: MarkdownSegmenter = MarkdownSegmenter(chunk_size=self.chunk_size)
+
+        with open(self.filepath, encoding="utf-8", buffering=self.read_size) as f:
+            blocks: Iterator[str] = iter(partial(f.read, self.read_size), "")
+            yield from segmenter.parse_stream(blocks, {"source": source})
+
+    def _embed_segments(
+        self,
+        embedder: BaseEmbedder,
+        segment_queue: Queue[list[Segment] | None],
+        embed_queue: Queue[tuple[list[Segment], NDArray[np.float32]] | None]
+    ) -> None:
+        """
+        向量化阶段：从队列取出片段批次，并发编码后按原顺序交给写入阶段
+
+        同时在途的请求不超过 max_workers 个，限流重试由各 Embedder 自身处理。
+        """
+        pending: deque[tuple[list[Segment], Future[NDArray[np.float32]]]] = deque()
+
+        def flush_oldest() -> None:
+            """等待最早提交的批次完成并交给写入阶段"""
+            segments, future = pending.popleft()
+            try:
+                embeddings: NDArray[np.float32] = future.result()
+            except Exception:
+                self.errors.append(traceback.format_exc())
+                return
+
+            if not self.errors:
+                embed_queue.put((segments, embeddings))
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                while True:
+                    segments: list[Segment] | None = segment_queue.get()
+                    if segments is None:
+                        break
+
+                    # 已停止或出错，仅排空队列
+                    if self.stopped or self.errors:
+                        continue
+
+                    texts: list[str] = [seg.text for seg in segments]
+                    pending.append((segments, executor.submit(embedder.encode, texts)))
+
+                    if len(pending) >= self.max_workers:
+                        flush_oldest()
+
+                while pending:
+                    flush_oldest()
+        finally:
+            embed_queue.put(None)
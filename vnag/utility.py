@@ -1,9 +1,13 @@
-import json
+import os
 import sys
+from functools import cache
 
 from pathlib import Path
 
+import orjson
 
+
+@cache
 def _get_agent_dir(temp_name: str) -> tuple[Path, Path]:
     """获取运行时目录"""
     cwd: Path = Path.cwd()
@@ -18,8 +22,7 @@ def _get_agent_dir(temp_name: str) -> tuple[Path, Path]:
     temp_path = home_path.joinpath(temp_name)
 
     # 如果.vnag目录不存在，则创建它
-    if not temp_path.exists():
-        temp_path.mkdir()
+    temp_path.mkdir(exist_ok=True)
 
     return home_path, temp_path
 
@@ -27,8 +30,10 @@ def _get_agent_dir(temp_name: str) -> tuple[Path, Path]:
 # 获取运行目录
 WORKING_DIR, TEMP_DIR = _get_agent_dir(".vnag")
 
-# 添加到path路径
-sys.path.append(str(WORKING_DIR))
+# 添加到path路径（避免重复添加）
+_working_path: str = os.fspath(WORKING_DIR)
+if _working_path not in sys.path:
+    sys.path.append(_working_path)
 
 
 def get_file_path(filename: str) -> Path:
@@ -36,11 +41,16 @@ def get_file_path(filename: str) -> Path:
     return TEMP_DIR.joinpath(filename)
 
 
+# 已确认存在的临时文件夹
+_ensured_folders: set[Path] = set()
+
+
 def get_folder_path(folder_name: str) -> Path:
-    """获取临时文件夹路径"""
+    """获取临时文件夹路径（每个文件夹只在首次获取时检查创建）"""
     folder_path: Path = TEMP_DIR.joinpath(folder_name)
-    if not folder_path.exists():
-        folder_path.mkdir()
+    if folder_path not in _ensured_folders:
+        folder_path.mkdir(parents=True, exist_ok=True)
+        _ensured_folders.add(folder_path)
     return folder_path
 
 
@@ -49,8 +59,7 @@ def load_json(filename: str) -> dict:
     filepath: Path = get_file_path(filename)
 
     if filepath.exists():
-        with open(filepath, encoding="UTF-8") as f:
-            data: dict = json.load(f)
+        data: dict = orjson.loads(filepath.read_bytes())
         return data
     else:
         return {}
@@ -60,19 +69,35 @@ def save_json(filename: str, data: dict | list) -> None:
     """保存JSON文件"""
     filepath: Path = get_file_path(filename)
 
-    with open(filepath, mode="w+", encoding="UTF-8") as f:
-        json.dump(
-            data,
-            f,
-            indent=4,
-            ensure_ascii=False
-        )
+    filepath.write_bytes(
+        orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    )
+
+
+def scan_json_files(folder: Path) -> list[Path]:
+    """
+    列出目录下的 JSON 文件
+
+    使用单次 scandir 遍历，目录项类型来自 readdir 结果，无需逐个文件 stat。
+    """
+    with os.scandir(folder) as it:
+        return [
+            Path(entry.path) for entry in it
+            if entry.name.endswith(".json") and entry.is_file()
+        ]
 
 
 def read_text_file(path: str | Path) -> str:
     """读取文本文件，使用 UTF-8 编码。"""
     p: Path = Path(path)
-    text: str = p.read_text(encoding="utf-8")
+
+    # 一次读取全部字节再解码，避免文本模式逐块增量解码
+    text: str = p.read_bytes().decode("utf-8")
+
+    # 与文本模式一致，统一换行符为 \n
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+
     return text
 
 
@@ -82,8 +107,20 @@ def write_text_file(path: str | Path, content: str) -> None:
     p.write_text(content, encoding="utf-8")
 
 
-PROFILE_DIR: Path = TEMP_DIR.joinpath("profile")
-PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+SIZE_UNITS: tuple[str, ...] = ("B", "KB", "MB", "GB", "TB")
+
+
+def format_size(size: int) -> str:
+    """将字节数格式化为可读字符串（保留一位小数，仅使用整数运算）。"""
+    # 每 10 个二进制位对应一级单位
+    level: int = min(max(size.bit_length() - 1, 0) // 10, len(SIZE_UNITS) - 1)
+    if not level:
+        return f"{size} B"
+
+    tenths: int = (size * 10) >> (10 * level)
+    return f"{tenths // 10}.{tenths % 10} {SIZE_UNITS[level]}"
+
+
+PROFILE_DIR: Path = get_folder_path("profile")
 
-SESSION_DIR: Path = TEMP_DIR.joinpath("session")
-SESSION_DIR.mkdir(parents=True, exist_ok=True)
+SESSION_DIR: Path = get_folder_path("session")
@@ -1,8 +1,21 @@
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
+from typing import Any
 
 from .object import Segment
 
 
+def stringify_metadata(metadata: Mapping[str, Any]) -> dict[str, str]:
+    """
+    将数据库返回的元数据转换为 Segment 要求的 dict[str, str]。
+
+    写入的元数据通常已全部为字符串，此时直接复制，无需逐项调用 str()。
+    """
+    if set(map(type, metadata.values())) <= {str}:
+        return dict(metadata)
+    return {str(key): str(value) for key, value in metadata.items()}
+
+
 class BaseVector(ABC):
     """
     向量存储的抽象基类。
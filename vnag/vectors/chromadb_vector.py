@@ -12,7 +12,7 @@ from chromadb.config import Settings as ChromaSettings
 
 from vnag.object import Segment
 from vnag.utility import get_folder_path
-from vnag.vector import BaseVector
+from vnag.vector import BaseVector, stringify_metadata
 from vnag.embedder import BaseEmbedder
 
 
@@ -37,6 +37,9 @@ class ChromadbVector(BaseVector):
             name="segments", metadata={"hnsw:space": "cosine"}
         )
 
+        # 单批写入上限由 Chroma 根据底层 SQLite 参数数量限制计算
+        self.max_batch_size: int = self.client.get_max_batch_size()
+
     def add_segments(self, segments: list[Segment]) -> list[str]:
         """将一批文档块添加到 ChromaDB 中。"""
         if not segments:
@@ -55,8 +58,8 @@ class ChromadbVector(BaseVector):
             for seg in segments
         ]
 
-        # 分批写入，避免触发 Chroma 单批上限（约 5461）
-        db_batch_size: int = 3000
+        # 按 Chroma 允许的最大批次分批写入，减少写入次数
+        db_batch_size: int = self.max_batch_size
         for i in range(0, len(ids), db_batch_size):
             j = i + db_batch_size
             self.collection.upsert(
@@ -70,12 +73,7 @@ class ChromadbVector(BaseVector):
 
     def retrieve(self, query_text: str, k: int = 5) -> list[Segment]:
         """根据查询文本，从 ChromaDB 中检索相似的文档块。"""
-        if self.count == 0:
-            return []
-
-        query_embedding_np: NDArray[np.float32] = self.embedder.encode(
-            [query_text]
-        )
+        query_embedding_np: NDArray[np.float32] = self.embedder.encode_query(query_text)
 
         results: QueryResult = self.collection.query(
             query_embeddings=query_embedding_np, n_results=k
@@ -94,9 +92,7 @@ class ChromadbVector(BaseVector):
         ):
             # ChromaDB 返回的 metadata 字典可能包含非字符串值，
             # 而 Segment 要求 dict[str, str]。这里进行转换以确保类型安全。
-            safe_meta: dict[str, str] = {
-                str(key): str(value) for key, value in meta.items()
-            }
+            safe_meta: dict[str, str] = stringify_metadata(meta)
 
             segment: Segment = Segment(text=text, metadata=safe_meta, score=dist)
             retrieved_results.append(segment)
@@ -130,7 +126,7 @@ class ChromadbVector(BaseVector):
         return [
             Segment(
                 text=text,
-                metadata={str(key): str(value) for key, value in meta.items()},
+                metadata=stringify_metadata(meta),
             )
             for text, meta in zip(documents, metadatas, strict=True)
         ]
@@ -151,7 +147,7 @@ class ChromadbVector(BaseVector):
         return [
             Segment(
                 text=text,
-                metadata={str(key): str(value) for key, value in meta.items()},
+                metadata=stringify_metadata(meta),
             )
             for text, meta in zip(documents, metadatas, strict=True)
         ]
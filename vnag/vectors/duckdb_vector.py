@@ -1,21 +1,44 @@
-import json
 from pathlib import Path
 from typing import Any
 
 import numpy as np
+import orjson
 from numpy.typing import NDArray
 import duckdb
 from duckdb import DuckDBPyConnection
 
 from vnag.object import Segment
 from vnag.utility import get_folder_path
-from vnag.vector import BaseVector
+from vnag.vector import BaseVector, stringify_metadata
 from vnag.embedder import BaseEmbedder
 
 
+# HNSW 索引度量对应的距离函数，查询时需与索引一致才能命中索引
+DISTANCE_FUNCTIONS: dict[str, str] = {
+    "cosine": "array_cosine_distance",
+    "ip": "array_negative_inner_product",
+}
+
+
+def normalize_embeddings(embeddings: NDArray[np.float32]) -> NDArray[np.float32]:
+    """将向量矩阵按行归一化为单位向量。"""
+    norms: NDArray[np.floating[Any]] = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    normalized: NDArray[np.float32] = embeddings / np.maximum(norms, 1e-12)
+    return normalized
+
+
 class DuckdbVector(BaseVector):
     """基于 DuckDB VSS 扩展实现的向量存储。"""
 
+    # HNSW 索引的距离度量：向量写入前已归一化，内积即余弦相似度，
+    # 检索时无需再对每个候选向量计算范数
+    metric: str = "ip"
+
+    # HNSW 索引参数：M 和 ef_construction 在建索引时生效，ef_search 在检索时生效
+    m: int = 16
+    ef_construction: int = 128
+    ef_search: int = 64
+
     def __init__(
         self,
         name: str,
@@ -26,15 +49,38 @@ class DuckdbVector(BaseVector):
         self.db_path: Path = self.persist_dir.joinpath(f"{name}.duckdb")
         self.embedder: BaseEmbedder = embedder
 
-        # 通过编码样本获取实际维度
-        self.dimension: int = embedder.encode(["duckdb"]).shape[1]
+        # 是否处于显式开启的事务中
+        self.in_transaction: bool = False
 
         # 创建数据库连接
         self.conn: DuckDBPyConnection = duckdb.connect(str(self.db_path))
 
+        # 已有数据表时直接读取向量维度，仅浏览数据时无需调用 Embedder
+        dimension: int | None = self._get_table_dimension()
+        if dimension is None:
+            dimension = embedder.dimension
+        self.dimension: int = dimension
+
         # 初始化数据库
         self._init_database()
 
+        # 检索语句只与维度和索引度量有关，初始化时生成一次
+        # 使用与索引度量一致的距离函数升序排序，以便命中 HNSW 索引
+        # 查询向量以 JSON 文本传入再在 SQL 中转换为数组：
+        # Python 客户端逐个元素绑定浮点数列表的开销远高于检索本身
+        distance_function: str = DISTANCE_FUNCTIONS[self.metric]
+        self.search_sql: str = f"""
+            SELECT
+                text,
+                metadata,
+                {distance_function}(
+                    embedding, ?::VARCHAR::FLOAT[{self.dimension}]
+                ) AS distance
+            FROM segments
+            ORDER BY distance
+            LIMIT ?;
+        """
+
     def _init_database(self) -> None:
         """初始化数据库：安装扩展、创建表和索引。"""
         # 安装并加载 VSS 扩展
@@ -44,7 +90,12 @@ class DuckdbVector(BaseVector):
         # 启用实验性持久化
         self.conn.execute("SET hnsw_enable_experimental_persistence = true;")
 
+        # 检索时的候选列表大小，作用于当前连接
+        self.conn.execute(f"SET hnsw_ef_search = {self.ef_search};")
+
         # 创建表（如果不存在）
+        # 向量列需保持 FLOAT（32 位）：VSS 的 HNSW 索引和 array_cosine_* 函数
+        # 只支持 FLOAT 数组，DuckDB 也没有半精度浮点类型
         create_table_sql: str = f"""
             CREATE TABLE IF NOT EXISTS segments (
                 id VARCHAR PRIMARY KEY,
@@ -56,21 +107,48 @@ class DuckdbVector(BaseVector):
         self.conn.execute(create_table_sql)
 
         # 检查索引是否存在，不存在则创建
-        index_exists: bool = self._check_index_exists("segments_hnsw_idx")
-        if not index_exists:
-            create_index_sql: str = """
+        index_sql: str | None = self._get_index_sql("segments_hnsw_idx")
+        if index_sql is None:
+            create_index_sql: str = f"""
                 CREATE INDEX segments_hnsw_idx ON segments
-                USING HNSW(embedding) WITH (metric = 'cosine');
+                USING HNSW(embedding) WITH (
+                    metric = '{self.metric}',
+                    M = {self.m},
+                    ef_construction = {self.ef_construction}
+                );
             """
             self.conn.execute(create_index_sql)
+        elif "'ip'" not in index_sql:
+            # 旧版本创建的余弦索引中存有未归一化的向量，继续使用余弦距离
+            self.metric = "cosine"
 
-    def _check_index_exists(self, index_name: str) -> bool:
-        """检查索引是否存在。"""
+    def _get_table_dimension(self) -> int | None:
+        """从已有数据表的 embedding 列类型（如 FLOAT[1024]）中读取向量维度。"""
         result = self.conn.execute(
-            "SELECT COUNT(*) FROM duckdb_indexes() WHERE index_name = ?",
+            """
+            SELECT data_type FROM duckdb_columns()
+            WHERE table_name = 'segments' AND column_name = 'embedding'
+            """
+        ).fetchone()
+
+        if result is None:
+            return None
+
+        data_type: str = result[0]
+        return int(data_type[data_type.index("[") + 1:-1])
+
+    def _get_index_sql(self, index_name: str) -> str | None:
+        """获取索引的创建语句，索引不存在时返回 None。"""
+        result = self.conn.execute(
+            "SELECT sql FROM duckdb_indexes() WHERE index_name = ?",
             [index_name]
         ).fetchone()
-        return result is not None and result[0] > 0
+
+        if result is None:
+            return None
+
+        index_sql: str = result[0]
+        return index_sql
 
     def add_segments(self, segments: list[Segment]) -> list[str]:
         """将一批文档块添加到 DuckDB 中。"""
@@ -81,86 +159,139 @@ class DuckdbVector(BaseVector):
 
         embeddings_np: NDArray[np.float32] = self.embedder.encode(texts)
 
+        return self.add_embeddings(segments, embeddings_np)
+
+    def add_embeddings(
+        self,
+        segments: list[Segment],
+        embeddings: NDArray[np.float32]
+    ) -> list[str]:
+        """
+        将一批已完成向量化的文档块写入 DuckDB。
+
+        用于导入流水线：向量化与数据库写入在不同线程中进行，
+        写入阶段无需再次调用 Embedder。
+
+        Args:
+            segments: 文档块列表。
+            embeddings: 与 segments 一一对应的向量矩阵。
+
+        Returns:
+            写入的文档块ID列表。
+        """
+        if not segments:
+            return []
+
         # 生成唯一ID
         ids: list[str] = [
             f"{seg.metadata['source']}_{seg.metadata['chunk_index']}"
             for seg in segments
         ]
 
-        # 准备插入数据
+        embeddings = normalize_embeddings(embeddings)
+
+        # 未处于外部事务时，整批写入放在同一个事务中提交
+        if self.in_transaction:
+            self._insert_rows(ids, segments, embeddings)
+        else:
+            with self:
+                self._insert_rows(ids, segments, embeddings)
+
+        return ids
+
+    def _insert_rows(
+        self,
+        ids: list[str],
+        segments: list[Segment],
+        embeddings: NDArray[np.float32]
+    ) -> None:
+        """
+        批量写入文档块数据。
+
+        向量矩阵转置后注册为 DuckDB 表（每个维度一列），在 SQL 中按位置拼接为数组，
+        整批数据一条语句写入，避免逐行绑定浮点数列表参数的转换开销。
+        """
+        texts: list[str] = [seg.text for seg in segments]
+        metadatas: list[str] = [orjson.dumps(seg.metadata).decode() for seg in segments]
+
         insert_sql: str = """
             INSERT OR REPLACE INTO segments (id, text, metadata, embedding)
-            VALUES (?, ?, ?, ?);
+            SELECT rows.id, rows.text, rows.metadata, vectors.embedding
+            FROM (
+                SELECT unnest($1) AS id, unnest($2) AS text, unnest($3) AS metadata
+            ) AS rows
+            POSITIONAL JOIN (
+                SELECT array_value(*COLUMNS(*)) AS embedding FROM embedding_batch
+            ) AS vectors;
         """
 
-        # 分批插入
-        db_batch_size: int = 1000
-        for i in range(0, len(ids), db_batch_size):
-            j: int = i + db_batch_size
-            batch_ids: list[str] = ids[i:j]
-            batch_texts: list[str] = texts[i:j]
-            batch_segments: list[Segment] = segments[i:j]
-            batch_embeddings: NDArray[np.float32] = embeddings_np[i:j]
-
-            for seg_id, text, seg, embedding in zip(
-                batch_ids,
-                batch_texts,
-                batch_segments,
-                batch_embeddings,
-                strict=True
-            ):
-                metadata_json: str = json.dumps(
-                    seg.metadata, ensure_ascii=False
-                )
-                embedding_list: list[float] = embedding.tolist()
-                self.conn.execute(
-                    insert_sql,
-                    [seg_id, text, metadata_json, embedding_list]
-                )
-
-        return ids
+        self.conn.register(
+            "embedding_batch",
+            np.ascontiguousarray(embeddings.T, dtype=np.float32)
+        )
+        try:
+            self.conn.execute(insert_sql, [ids, texts, metadatas])
+        finally:
+            self.conn.unregister("embedding_batch")
+
+    def begin(self) -> None:
+        """开启事务，之后的写入在 commit 时一次性提交。"""
+        self.conn.execute("BEGIN TRANSACTION;")
+        self.in_transaction = True
+
+    def commit(self) -> None:
+        """提交事务。"""
+        self.conn.execute("COMMIT;")
+        self.in_transaction = False
+
+    def rollback(self) -> None:
+        """回滚事务，撤销事务开启后的所有写入。"""
+        self.conn.execute("ROLLBACK;")
+        self.in_transaction = False
+
+    def __enter__(self) -> "DuckdbVector":
+        """以上下文管理器方式开启事务。"""
+        self.begin()
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, *args: Any) -> None:
+        """正常退出时提交事务，发生异常时回滚。"""
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
 
     def retrieve(self, query_text: str, k: int = 5) -> list[Segment]:
         """根据查询文本，从 DuckDB 中检索相似的文档块。"""
-        if self.count == 0:
-            return []
-
-        query_embedding_np: NDArray[np.float32] = self.embedder.encode([query_text])
-        query_embedding_list: list[float] = query_embedding_np[0].tolist()
+        # 空查询没有语义可言，直接按顺序返回，无需编码和相似度计算
+        if not query_text.strip():
+            return self.list_segments(limit=k)
 
-        # 使用余弦相似度进行搜索
-        # 注意：array_cosine_similarity 返回相似度（越大越相似）
-        # 为与 ChromaDB 保持一致，转换为距离（1 - similarity）
-        search_sql: str = f"""
-            SELECT
-                id,
-                text,
-                metadata,
-                array_cosine_similarity(embedding, ?::FLOAT[{self.dimension}]) AS similarity
-            FROM segments
-            ORDER BY similarity DESC
-            LIMIT ?;
-        """
+        query_embedding_np: NDArray[np.float32] = normalize_embeddings(
+            self.embedder.encode_query(query_text)
+        )
+        query_embedding_json: str = orjson.dumps(
+            query_embedding_np[0], option=orjson.OPT_SERIALIZE_NUMPY
+        ).decode()
 
         results = self.conn.execute(
-            search_sql,
-            [query_embedding_list, k]
+            self.search_sql,
+            [query_embedding_json, k]
         ).fetchall()
 
         retrieved_results: list[Segment] = []
         for row in results:
-            text: str = row[1]
-            metadata_json: str = row[2]
-            similarity: float = row[3]
+            text: str = row[0]
+            metadata_json: str = row[1]
+            distance: float = row[2]
 
             # 解析 metadata JSON
-            metadata: dict[str, Any] = json.loads(metadata_json)
-            safe_meta: dict[str, str] = {
-                str(key): str(value) for key, value in metadata.items()
-            }
+            metadata: dict[str, Any] = orjson.loads(metadata_json)
+            safe_meta: dict[str, str] = stringify_metadata(metadata)
 
-            # 转换为距离（与 ChromaDB 一致）
-            distance: float = 1.0 - similarity
+            # 单位向量的负内积加 1 即余弦距离（与 ChromaDB 一致）
+            if self.metric == "ip":
+                distance += 1.0
 
             segment: Segment = Segment(
                 text=text,
@@ -192,7 +323,7 @@ class DuckdbVector(BaseVector):
 
         placeholders: str = ", ".join(["?"] * len(segment_ids))
         select_sql: str = f"""
-            SELECT id, text, metadata FROM segments
+            SELECT text, metadata FROM segments
             WHERE id IN ({placeholders});
         """
 
@@ -200,13 +331,11 @@ class DuckdbVector(BaseVector):
 
         segments: list[Segment] = []
         for row in results:
-            text: str = row[1]
-            metadata_json: str = row[2]
+            text: str = row[0]
+            metadata_json: str = row[1]
 
-            metadata: dict[str, Any] = json.loads(metadata_json)
-            safe_meta: dict[str, str] = {
-                str(key): str(value) for key, value in metadata.items()
-            }
+            metadata: dict[str, Any] = orjson.loads(metadata_json)
+            safe_meta: dict[str, str] = stringify_metadata(metadata)
 
             segment: Segment = Segment(text=text, metadata=safe_meta)
             segments.append(segment)
@@ -216,7 +345,7 @@ class DuckdbVector(BaseVector):
     def list_segments(self, limit: int = 100, offset: int = 0) -> list[Segment]:
         """分页获取向量存储中的文档块（不需要语义查询）。"""
         select_sql: str = """
-            SELECT id, text, metadata FROM segments
+            SELECT text, metadata FROM segments
             ORDER BY id
             LIMIT ? OFFSET ?;
         """
@@ -225,19 +354,22 @@ class DuckdbVector(BaseVector):
 
         segments: list[Segment] = []
         for row in results:
-            text: str = row[1]
-            metadata_json: str = row[2]
+            text: str = row[0]
+            metadata_json: str = row[1]
 
-            metadata: dict[str, Any] = json.loads(metadata_json)
-            safe_meta: dict[str, str] = {
-                str(key): str(value) for key, value in metadata.items()
-            }
+            metadata: dict[str, Any] = orjson.loads(metadata_json)
+            safe_meta: dict[str, str] = stringify_metadata(metadata)
 
             segment: Segment = Segment(text=text, metadata=safe_meta)
             segments.append(segment)
 
         return segments
 
+    def close(self) -> None:
+        """关闭数据库连接，并释放 Embedder 占用的资源。"""
+        self.conn.close()
+        self.embedder.close()
+
     @property
     def count(self) -> int:
         """获取向量存储中的文档总数。"""
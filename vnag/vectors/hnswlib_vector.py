@@ -0,0 +1,243 @@
+import sqlite3
+from pathlib import Path
+from typing import Any
+
+import hnswlib
+import numpy as np
+import orjson
+from numpy.typing import NDArray
+
+from vnag.object import Segment
+from vnag.utility import get_folder_path
+from vnag.vector import BaseVector, stringify_metadata
+from vnag.embedder import BaseEmbedder
+
+
+class HnswlibVector(BaseVector):
+    """
+    基于 hnswlib 实现的进程内向量存储。
+
+    向量检索直接调用 hnswlib 的 C++ 索引，返回整数标签；
+    文档内容和元数据保存在 SQLite 中，按标签一次查询取回。
+    """
+
+    # HNSW 索引参数
+    m: int = 32
+    ef_construction: int = 200
+    ef_search: int = 64
+
+    # 索引初始容量，写满后按倍数扩容
+    init_capacity: int = 10000
+
+    def __init__(
+        self,
+        name: str,
+        embedder: BaseEmbedder
+    ) -> None:
+        """初始化 hnswlib 向量存储。"""
+        self.persist_dir: Path = get_folder_path("hnswlib_vector").joinpath(name)
+        self.persist_dir.mkdir(exist_ok=True)
+
+        self.index_path: Path = self.persist_dir.joinpath("index.bin")
+        self.db_path: Path = self.persist_dir.joinpath("segments.db")
+        self.embedder: BaseEmbedder = embedder
+
+        # 文档总数缓存，写入或删除后失效
+        self.count_cache: int | None = None
+
+        self.dimension: int = embedder.dimension
+
+        # 文档内容和元数据存储
+        self.conn: sqlite3.Connection = sqlite3.connect(
+            str(self.db_path), check_same_thread=False
+        )
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS segments (
+                label INTEGER PRIMARY KEY,
+                id TEXT UNIQUE,
+                text TEXT,
+                metadata TEXT
+            );
+            """
+        )
+        self.conn.commit()
+
+        # 向量索引
+        self.index: Any = hnswlib.Index(space="cosine", dim=self.dimension)
+        if self.index_path.exists():
+            self.index.load_index(str(self.index_path))
+        else:
+            self.index.init_index(
+                max_elements=self.init_capacity,
+                ef_construction=self.ef_construction,
+                M=self.m,
+            )
+        self.index.set_ef(self.ef_search)
+
+    def add_segments(self, segments: list[Segment]) -> list[str]:
+        """将一批文档块添加到 hnswlib 中。"""
+        if not segments:
+            return []
+
+        texts: list[str] = [seg.text for seg in segments]
+
+        embeddings_np: NDArray[np.float32] = self.embedder.encode(texts)
+
+        # 使用source（绝对路径）和chunk_index组合生成唯一ID
+        ids: list[str] = [
+            f"{seg.metadata['source']}_{seg.metadata['chunk_index']}"
+            for seg in segments
+        ]
+
+        # 已存在的ID沿用原标签（覆盖向量），其余分配新标签
+        labels_map: dict[str, int] = self._get_labels(ids)
+
+        row: tuple[int | None] | None = self.conn.execute(
+            "SELECT MAX(label) FROM segments"
+        ).fetchone()
+        next_label: int = row[0] + 1 if row and row[0] is not None else 0
+
+        labels: list[int] = []
+        for seg_id in ids:
+            label: int | None = labels_map.get(seg_id)
+            if label is None:
+                label = next_label
+                labels_map[seg_id] = label
+                next_label += 1
+            labels.append(label)
+
+        # 容量不足时扩容
+        required: int = self.index.get_current_count() + len(ids)
+        capacity: int = self.index.get_max_elements()
+        if required > capacity:
+            self.index.resize_index(max(required, capacity * 2))
+
+        self.index.add_items(embeddings_np, np.asarray(labels, dtype=np.int64))
+
+        rows: list[tuple[int, str, str, str]] = [
+            (label, seg_id, seg.text, orjson.dumps(seg.metadata).decode())
+            for label, seg_id, seg in zip(labels, ids, segments, strict=True)
+        ]
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO segments (label, id, text, metadata) VALUES (?, ?, ?, ?)",
+            rows
+        )
+        self.conn.commit()
+        self.count_cache = None
+
+        self.index.save_index(str(self.index_path))
+
+        return ids
+
+    def retrieve(self, query_text: str, k: int = 5) -> list[Segment]:
+        """根据查询文本，从 hnswlib 中检索相似的文档块。"""
+        count: int = self.count
+        if count == 0:
+            return []
+
+        query_embedding_np: NDArray[np.float32] = self.embedder.encode_query(query_text)
+
+        k = min(k, count)
+        self.index.set_ef(max(self.ef_search, k))
+
+        labels, distances = self.index.knn_query(query_embedding_np, k=k)
+
+        # 按标签一次取回文档内容，再按检索顺序组装
+        found: list[int] = [int(label) for label in labels[0]]
+        rows: dict[int, tuple[str, str]] = {
+            row[0]: (row[1], row[2])
+            for row in self._select("label", found, "label, text, metadata")
+        }
+
+        retrieved_results: list[Segment] = []
+        for label, distance in zip(found, distances[0], strict=True):
+            if label not in rows:
+                continue
+
+            text, metadata_json = rows[label]
+            segment: Segment = Segment(
+                text=text,
+                metadata=stringify_metadata(orjson.loads(metadata_json)),
+                score=float(distance)
+            )
+            retrieved_results.append(segment)
+
+        return retrieved_results
+
+    def delete_segments(self, segment_ids: list[str]) -> bool:
+        """根据ID列表，从 hnswlib 中删除一个或多个文档。"""
+        if not segment_ids:
+            return True
+
+        try:
+            labels_map: dict[str, int] = self._get_labels(segment_ids)
+            for label in labels_map.values():
+                self.index.mark_deleted(label)
+
+            self.conn.executemany(
+                "DELETE FROM segments WHERE id = ?",
+                [(seg_id,) for seg_id in segment_ids]
+            )
+            self.conn.commit()
+            self.count_cache = None
+
+            self.index.save_index(str(self.index_path))
+            return True
+        except Exception:
+            return False
+
+    def get_segments(self, segment_ids: list[str]) -> list[Segment]:
+        """根据ID列表，从 SQLite 中直接获取原始的文档块。"""
+        if not segment_ids:
+            return []
+
+        return [
+            Segment(text=row[0], metadata=stringify_metadata(orjson.loads(row[1])))
+            for row in self._select("id", segment_ids, "text, metadata")
+        ]
+
+    def list_segments(self, limit: int = 100, offset: int = 0) -> list[Segment]:
+        """分页获取向量存储中的文档块（不需要语义查询）。"""
+        rows: list[tuple[str, str]] = self.conn.execute(
+            "SELECT text, metadata FROM segments ORDER BY label LIMIT ? OFFSET ?",
+            (limit, offset)
+        ).fetchall()
+
+        return [
+            Segment(text=text, metadata=stringify_metadata(orjson.loads(metadata_json)))
+            for text, metadata_json in rows
+        ]
+
+    @property
+    def count(self) -> int:
+        """获取向量存储中的文档总数（缓存结果，检索时无需每次查询）。"""
+        if self.count_cache is None:
+            row: tuple[int] | None = self.conn.execute(
+                "SELECT COUNT(*) FROM segments"
+            ).fetchone()
+            self.count_cache = row[0] if row else 0
+
+        return self.count_cache
+
+    def _get_labels(self, segment_ids: list[str]) -> dict[str, int]:
+        """查询文档ID对应的索引标签。"""
+        return {
+            row[0]: row[1]
+            for row in self._select("id", segment_ids, "id, label")
+        }
+
+    def _select(self, key: str, values: list[Any], columns: str) -> list[tuple]:
+        """按键值列表分批查询，避免超出 SQLite 参数数量上限。"""
+        rows: list[tuple] = []
+
+        batch_size: int = 500
+        for i in range(0, len(values), batch_size):
+            batch: list[Any] = values[i:i + batch_size]
+            placeholders: str = ", ".join("?" * len(batch))
+            rows.extend(self.conn.execute(
+                f"SELECT {columns} FROM segments WHERE {key} IN ({placeholders})",
+                batch
+            ).fetchall())
+
+        return rows
@@ -1,6 +1,8 @@
+import hashlib
 from pathlib import Path
+from threading import Lock
 from typing import Any
-from uuid import uuid5, NAMESPACE_DNS
+from uuid import NAMESPACE_DNS
 
 import numpy as np
 from numpy.typing import NDArray
@@ -8,16 +10,51 @@ from qdrant_client import QdrantClient
 from qdrant_client.models import (
     Distance,
     VectorParams,
-    PointStruct,
     CollectionDescription
 )
 
 from vnag.object import Segment
 from vnag.utility import get_folder_path
-from vnag.vector import BaseVector
+from vnag.vector import BaseVector, stringify_metadata
 from vnag.embedder import BaseEmbedder
 
 
+# 命名空间部分的 SHA1 状态，生成 UUID 时复制后继续计算
+NAMESPACE_SHA1 = hashlib.sha1(NAMESPACE_DNS.bytes)
+
+
+def get_point_id(string_id: str) -> str:
+    """
+    将字符串ID转为 Qdrant 要求的 UUID，结果与 str(uuid5(NAMESPACE_DNS, string_id)) 一致。
+
+    复用命名空间的哈希状态并直接格式化摘要，省去逐个构建 UUID 对象的开销。
+    """
+    sha1 = NAMESPACE_SHA1.copy()
+    sha1.update(string_id.encode())
+
+    data: bytearray = bytearray(sha1.digest()[:16])
+    data[6] = (data[6] & 0x0F) | 0x50       # 版本号 5
+    data[8] = (data[8] & 0x3F) | 0x80       # RFC 4122 变体
+
+    h: str = data.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+# 进程内共享的 Qdrant 客户端：本地模式下同一存储目录只能被一个客户端打开
+CLIENTS: dict[str, QdrantClient] = {}
+CLIENTS_LOCK: Lock = Lock()
+
+
+def get_client(path: str) -> QdrantClient:
+    """获取指定存储目录的 Qdrant 客户端，同一进程内复用已打开的实例"""
+    with CLIENTS_LOCK:
+        client: QdrantClient | None = CLIENTS.get(path)
+        if client is None:
+            client = QdrantClient(path=path)
+            CLIENTS[path] = client
+        return client
+
+
 class QdrantVector(BaseVector):
     """基于 Qdrant 实现的向量存储。"""
 
@@ -31,12 +68,9 @@ class QdrantVector(BaseVector):
         self.embedder: BaseEmbedder = embedder
         self.collection_name: str = name
 
-        # 通过编码样本获取实际维度
-        self.dimension: int = embedder.encode(["qdrant"]).shape[1]
+        self.dimension: int = embedder.dimension
 
-        self.client: QdrantClient = QdrantClient(
-            path=str(self.persist_dir)
-        )
+        self.client: QdrantClient = get_client(str(self.persist_dir))
 
         # 创建或获取集合
         self._init_collection()
@@ -70,54 +104,39 @@ class QdrantVector(BaseVector):
             for seg in segments
         ]
 
-        # 构建 Qdrant Points
-        points: list[PointStruct] = []
-        for string_id, segment, embedding in zip(
-            string_ids,
-            segments,
-            embeddings_np,
-            strict=True
-        ):
-            # 将字符串ID转为UUID（Qdrant要求）
-            uuid_id: str = str(uuid5(NAMESPACE_DNS, string_id))
-
-            # 构建 payload（包含文本、元数据和原始字符串ID）
-            payload: dict[str, Any] = segment.metadata.copy()
-            payload["text"] = segment.text
-            payload["string_id"] = string_id
-
-            point: PointStruct = PointStruct(
-                id=uuid_id,
-                vector=embedding.tolist(),
-                payload=payload
-            )
-            points.append(point)
+        # 将字符串ID转为UUID（Qdrant要求）
+        uuid_ids: list[str] = [
+            get_point_id(string_id) for string_id in string_ids
+        ]
 
-        # 分批插入，避免单批数据过大导致超时
-        db_batch_size: int = 1000
-        for i in range(0, len(points), db_batch_size):
-            self.client.upsert(
-                collection_name=self.collection_name,
-                points=points[i:i + db_batch_size]
-            )
+        # 构建 payload（包含文本、元数据和原始字符串ID）
+        payloads: list[dict[str, Any]] = [
+            {**segment.metadata, "text": segment.text, "string_id": string_id}
+            for string_id, segment in zip(string_ids, segments, strict=True)
+        ]
+
+        # 直接传入向量矩阵，由客户端负责分批上传，无需逐点构建 PointStruct
+        self.client.upload_collection(
+            collection_name=self.collection_name,
+            vectors=embeddings_np,
+            payload=payloads,
+            ids=uuid_ids,
+            batch_size=1000,
+            wait=True
+        )
 
         return string_ids
 
     def retrieve(self, query_text: str, k: int = 5) -> list[Segment]:
         """根据查询文本，从 Qdrant 中检索相似的文档块。"""
-        if self.count == 0:
-            return []
-
-        query_embedding_np: NDArray[np.float32] = self.embedder.encode(
-            [query_text]
-        )
+        query_embedding_np: NDArray[np.float32] = self.embedder.encode_query(query_text)
 
         # 执行搜索
-        search_result = self.client.search(
+        search_result = self.client.query_points(
             collection_name=self.collection_name,
-            query_vector=query_embedding_np[0].tolist(),
+            query=query_embedding_np[0],
             limit=k
-        )
+        ).points
 
         # 构建返回结果
         retrieved_results: list[Segment] = []
@@ -129,9 +148,7 @@ class QdrantVector(BaseVector):
             text: str = payload.pop("text", "")
 
             # 转换 payload 为 metadata
-            safe_meta: dict[str, str] = {
-                str(key): str(value) for key, value in payload.items()
-            }
+            safe_meta: dict[str, str] = stringify_metadata(payload)
 
             # Qdrant 返回 score（余弦相似度，越大越相似）
             # ChromaDB 返回 distance（余弦距离，越小越相似）
@@ -153,9 +170,7 @@ class QdrantVector(BaseVector):
 
         try:
             # 将字符串ID转为UUID
-            uuid_ids: list[str] = [
-                str(uuid5(NAMESPACE_DNS, sid)) for sid in segment_ids
-            ]
+            uuid_ids: list[str] = [get_point_id(sid) for sid in segment_ids]
             self.client.delete(
                 collection_name=self.collection_name,
                 points_selector=uuid_ids
@@ -170,9 +185,7 @@ class QdrantVector(BaseVector):
             return []
 
         # 将字符串ID转为UUID
-        uuid_ids: list[str] = [
-            str(uuid5(NAMESPACE_DNS, sid)) for sid in segment_ids
-        ]
+        uuid_ids: list[str] = [get_point_id(sid) for sid in segment_ids]
 
         points = self.client.retrieve(
             collection_name=self.collection_name,
@@ -187,9 +200,7 @@ class QdrantVector(BaseVector):
                 payload = {}
             text: str = payload.pop("text", "")
 
-            safe_meta: dict[str, str] = {
-                str(key): str(value) for key, value in payload.items()
-            }
+            safe_meta: dict[str, str] = stringify_metadata(payload)
 
             segment: Segment = Segment(text=text, metadata=safe_meta)
             results.append(segment)
@@ -219,9 +230,7 @@ class QdrantVector(BaseVector):
                 payload = {}
             text: str = payload.pop("text", "")
 
-            safe_meta: dict[str, str] = {
-                str(key): str(value) for key, value in payload.items()
-            }
+            safe_meta: dict[str, str] = stringify_metadata(payload)
 
             segment: Segment = Segment(text=text, metadata=safe_meta)
             results.append(segment)